@@ -1 +1,9 @@
-from airtable_blog_writer import AirtableBlogWriter
\ No newline at end of file
+__all__ = ['AirtableBlogWriter']
+
+
+def __getattr__(name):
+    # Import lazily so importing the package does not pull in requests/httpx
+    if name == 'AirtableBlogWriter':
+        from airtable_blog_writer import AirtableBlogWriter
+        return AirtableBlogWriter
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,19 +1,72 @@
 import os
+import re
+import time
+import random
+import asyncio
 import requests
 import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Try to import httpx for concurrent writes, fallback to sequential requests if not available
+try:
+    import httpx
+    HAS_HTTPX = True
+except ImportError:
+    HAS_HTTPX = False
+    print("⚠️ httpx not installed. Install with: pip install httpx")
+
+# Try to import orjson for faster request bodies, fallback to stdlib json if not available
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Airtable allows 5 requests per second per base and 10 records per create request
+MAX_CONCURRENT_REQUESTS = 5
+AIRTABLE_BATCH_SIZE = 10
+
+# Rate-limited creates are retried with jittered exponential backoff, capped at RETRY_MAX_WAIT seconds.
+# Only 429 is retried: it means the records were not created, while a 5xx may follow a committed write
+MAX_RETRIES = 5
+RETRY_MAX_WAIT = 30
+
+# Meta lines emitted at the top of generated blogs
+_META_TITLE_RE = re.compile(r'^META_TITLE:[ \t]*(.*)$', re.M)
+_META_DESCRIPTION_RE = re.compile(r'^META_DESCRIPTION:[ \t]*(.*)$', re.M)
+
+# Seconds a connection test result is reused before probing Airtable again
+CONNECTION_CACHE_TTL = 60
+
+
+def _encode_json(payload):
+    """Serialize a request body to JSON bytes"""
+    if HAS_ORJSON:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode('utf-8')
+
+
+def _chunks(items, size):
+    """Yield successive `size`-sized slices of items"""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
 
 class AirtableBlogWriter:
-    def __init__(self):
-        """Initialize Airtable connection for blog storage"""
+    def __init__(self, session=None):
+        """Initialize Airtable connection for blog storage, optionally on a shared requests.Session"""
         self.api_key = os.getenv('AIRTABLE_API_KEY')
         self.base_id = os.getenv('AIRTABLE_BASE_ID')
         self.table_name = os.getenv('AIRTABLE_TABLE_NAME', 'Table 1')
 
+        # Cached connection test result as (value, expires_at)
+        self._connection_cache = (None, 0.0)
+
         if not self.api_key or not self.base_id:
             print("Missing Airtable credentials in .env file")
             return
@@ -24,60 +77,53 @@ class AirtableBlogWriter:
             'Content-Type': 'application/json'
         }
 
+        # Reuse one pooled session so keep-alive amortizes TLS handshakes, with 429 back-off.
+        # The session may be shared with other APIs, so auth headers are sent per request.
+        self.session = session or requests.Session()
+        # Record creates are not idempotent: only 429s (never processed) and connect errors (never sent) are retried,
+        # since a 5xx or read timeout can follow a committed write and a retry would duplicate records
+        retries = Retry(total=5, connect=5, read=0, status=5, backoff_factor=0.25, status_forcelist=[429],
+                        allowed_methods=['POST', 'GET'], respect_retry_after_header=True, raise_on_status=False)
+        self.session.mount('https://api.airtable.com/',
+                           HTTPAdapter(pool_connections=4, pool_maxsize=10, max_retries=retries))
+
     def extract_blog_sections(self, blog_content):
         """Extract different sections from blog content"""
-        sections = {
-            'meta_title': '',
-            'meta_description': '',
+        title_match = _META_TITLE_RE.search(blog_content)
+        description_match = _META_DESCRIPTION_RE.search(blog_content)
+
+        return {
+            'meta_title': title_match.group(1).strip() if title_match else '',
+            'meta_description': description_match.group(1).strip() if description_match else '',
             'main_content': blog_content
         }
 
-        lines = blog_content.split('\n')
-
-        for line in lines:
-            if line.startswith('META_TITLE:'):
-                sections['meta_title'] = line.replace('META_TITLE:', '').strip()
-            elif line.startswith('META_DESCRIPTION:'):
-                sections['meta_description'] = line.replace('META_DESCRIPTION:', '').strip()
+    def build_record(self, blog_result):
+        """Build the Airtable record for a blog result"""
+        # Only the existing Name and Notes fields are written; use extract_blog_sections
+        # for meta fields if you add them to the Airtable table
+        notes = ''.join([
+            'Generated: ', datetime.now().isoformat(sep=' ', timespec='seconds'),
+            ' | Model: ', str(blog_result.get('model_used', 'Unknown')),
+            ' | Tokens: ', format(blog_result.get('total_tokens', 0), ','),
+            ' | Cost: $', format(blog_result.get('cost', 0.0), '.4f'),
+        ])
 
-        return sections
+        return {
+            "fields": {
+                "Name": blog_result.get('topic', 'Unknown'),  # Maps to existing Name field
+                "Notes": notes  # Maps to existing Notes field
+            }
+        }
 
     def write_blog_to_airtable(self, blog_result):
         """Write blog result to Airtable"""
         try:
-            # Extract blog sections
-            sections = self.extract_blog_sections(blog_result.get('content', ''))
-
             # Prepare record data for Airtable
-            record_data = {
-                "records": [
-                    {
-                        "fields": {
-                            "Name": blog_result.get('topic', 'Unknown'),  # Maps to existing Name field
-                            "Notes": f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} | "
-                                     f"Model: {blog_result.get('model_used', 'Unknown')} | "
-                                     f"Tokens: {blog_result.get('total_tokens', 0):,} | "
-                                     f"Cost: ${blog_result.get('cost', 0.0):.4f}",  # Maps to existing Notes field
-                            # Add more fields if you created them in Airtable
-                            # "Meta Title": sections['meta_title'],
-                            # "Meta Description": sections['meta_description'],
-                            # "Blog Content": sections['main_content'][:50000],  # Airtable has field limits
-                            # "Word Count": blog_result.get('word_count', 0),
-                            # "Model Used": blog_result.get('model_used', 'Unknown'),
-                            # "Input Tokens": blog_result.get('input_tokens', 0),
-                            # "Output Tokens": blog_result.get('output_tokens', 0),
-                            # "Cost": blog_result.get('cost', 0.0),
-                            # "Generation Status": "Success" if blog_result.get('status') == 'success' else "Failed",
-                            # "SEO Keywords": ', '.join(blog_result.get('seo_keywords_used', [])),
-                            # "LLM Keywords": ', '.join(blog_result.get('llm_keywords_used', [])),
-                            # "Links Used": ', '.join(blog_result.get('links_used', []))
-                        }
-                    }
-                ]
-            }
+            record_data = {"records": [self.build_record(blog_result)]}
 
             # Make API call to Airtable
-            response = requests.post(self.base_url, headers=self.headers, json=record_data)
+            response = self.session.post(self.base_url, headers=self.headers, data=_encode_json(record_data), timeout=30)
 
             if response.status_code == 200:
                 created_record = response.json()
@@ -85,6 +131,8 @@ class AirtableBlogWriter:
                 print(f"✅ Blog '{blog_result.get('topic', 'Unknown')}' saved to Airtable! (ID: {record_id})")
                 return True
             else:
+                if response.status_code in (401, 403):
+                    self.invalidate_connection_cache()
                 print(f"❌ Airtable API error: {response.status_code} - {response.text}")
                 return False
 
@@ -92,29 +140,127 @@ class AirtableBlogWriter:
             print(f"❌ Error writing to Airtable: {str(e)}")
             return False
 
-    def write_multiple_blogs(self, blog_results):
-        """Write multiple blog results to Airtable"""
-        success_count = 0
-
+    def _split_successful(self, blog_results):
+        """Return successful blog results, reporting the ones that are skipped"""
+        successful_blogs = []
         for blog_result in blog_results:
             if blog_result.get('status') == 'success':
-                if self.write_blog_to_airtable(blog_result):
-                    success_count += 1
+                successful_blogs.append(blog_result)
             else:
                 print(f"⚠️ Skipping failed blog: {blog_result.get('topic', 'Unknown')}")
+        return successful_blogs
+
+    def _report_batch(self, batch, status_code, body, text):
+        """Report per-blog results for a batch POST and return the saved count"""
+        if status_code != 200:
+            if status_code in (401, 403):
+                self.invalidate_connection_cache()
+            print(f"❌ Airtable API error: {status_code} - {text}")
+            return 0
+
+        created_records = body.get('records', [])
+        for blog_result, created_record in zip(batch, created_records):
+            print(f"✅ Blog '{blog_result.get('topic', 'Unknown')}' saved to Airtable! (ID: {created_record['id']})")
+        return len(created_records)
+
+    def write_blogs_batched(self, blog_results, chunk=AIRTABLE_BATCH_SIZE):
+        """Write blog results to Airtable, up to `chunk` records per request"""
+        successful_blogs = self._split_successful(blog_results)
+        success_count = 0
+
+        for batch in _chunks(successful_blogs, chunk):
+            record_data = {"records": [self.build_record(b) for b in batch], "typecast": True}
+            try:
+                response = self.session.post(self.base_url, headers=self.headers, data=_encode_json(record_data), timeout=30)
+                body = response.json() if response.status_code == 200 else {}
+                success_count += self._report_batch(batch, response.status_code, body, response.text)
+            except Exception as e:
+                print(f"❌ Error writing to Airtable: {str(e)}")
 
-        print(
-            f"📊 Airtable Summary: {success_count}/{len([r for r in blog_results if r.get('status') == 'success'])} successful blogs saved to Airtable")
+        print(f"📊 Airtable Summary: {success_count}/{len(successful_blogs)} successful blogs saved to Airtable")
         return success_count
 
+    def _retry_delay(self, response, attempt):
+        """Seconds to wait before retrying a rate-limited create, or None if it should not be retried"""
+        if response.status_code != 429 or attempt >= MAX_RETRIES:
+            return None
+        try:
+            return min(float(response.headers.get('retry-after')), RETRY_MAX_WAIT)
+        except (TypeError, ValueError):
+            return random.uniform(0, min(RETRY_MAX_WAIT, 2 ** attempt))
+
+    async def _post_records(self, client, semaphore, batch):
+        """POST a batch of records to Airtable, bounded by the shared semaphore"""
+        record_data = {"records": [self.build_record(b) for b in batch], "typecast": True}
+        attempt = 0
+        while True:
+            async with semaphore:
+                try:
+                    response = await client.post(self.base_url, headers=self.headers, content=_encode_json(record_data))
+                except Exception as e:
+                    print(f"❌ Error writing to Airtable: {str(e)}")
+                    return 0
+
+            # Wait outside the semaphore so other batches can use the slot
+            delay = self._retry_delay(response, attempt)
+            if delay is None:
+                break
+            attempt += 1
+            print(f"⏳ Airtable rate limit, retrying in {delay:.1f}s ({attempt}/{MAX_RETRIES})")
+            await asyncio.sleep(delay)
+
+        body = response.json() if response.status_code == 200 else {}
+        return self._report_batch(batch, response.status_code, body, response.text)
+
+    async def write_multiple_blogs_async(self, blog_results):
+        """Write multiple blog results to Airtable concurrently"""
+        successful_blogs = self._split_successful(blog_results)
+
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        limits = httpx.Limits(max_connections=MAX_CONCURRENT_REQUESTS)
+        async with httpx.AsyncClient(timeout=30, limits=limits) as client:
+            outcomes = await asyncio.gather(*[
+                self._post_records(client, semaphore, batch)
+                for batch in _chunks(successful_blogs, AIRTABLE_BATCH_SIZE)
+            ])
+
+        success_count = sum(outcomes)
+        print(f"📊 Airtable Summary: {success_count}/{len(successful_blogs)} successful blogs saved to Airtable")
+        return success_count
+
+    def write_multiple_blogs(self, blog_results):
+        """Write multiple blog results to Airtable"""
+        if HAS_HTTPX:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                return asyncio.run(self.write_multiple_blogs_async(blog_results))
+            # asyncio.run cannot nest inside a running event loop; callers there can await the async version
+        return self.write_blogs_batched(blog_results)
+
+    def invalidate_connection_cache(self):
+        """Forget the cached connection test result"""
+        self._connection_cache = (None, 0.0)
+
     def test_connection(self):
-        """Test Airtable connection"""
+        """Test Airtable connection, reusing a recent result for CONNECTION_CACHE_TTL seconds"""
+        value, expires_at = self._connection_cache
+        if value is not None and time.monotonic() < expires_at:
+            return value
+
+        value = self._probe_connection()
+        self._connection_cache = (value, time.monotonic() + CONNECTION_CACHE_TTL)
+        return value
+
+    def _probe_connection(self):
+        """Probe Airtable with a live request"""
         try:
-            response = requests.get(self.base_url, headers=self.headers)
+            # A single record is enough to verify the token and table, and keeps the response tiny
+            response = self.session.get(self.base_url, headers=self.headers, params={'maxRecords': 1, 'pageSize': 1},
+                                        timeout=30)
 
             if response.status_code == 200:
-                data = response.json()
-                print(f"✅ Airtable connection successful! Found {len(data.get('records', []))} existing records")
+                print("✅ Airtable connection successful!")
                 return True
             else:
                 print(f"❌ Airtable connection failed: {response.status_code}")
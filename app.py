@@ -1,24 +1,72 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 import os
-import sys
 import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from typing import List, Optional
 from dotenv import load_dotenv
+from pydantic import BaseModel, Field, ValidationError
 
-# Add the src directory to Python path
-sys.path.append('src')
-
-# Import our modules
-from src.excel_reader import ExcelReader
-from src.blog_generator import BlogGenerator
-from airtable_blog_writer import AirtableBlogWriter
+__all__ = ['app', 'initialize_components']
 
 # Load environment variables
 load_dotenv()
 
+# Try to import orjson for faster JSON responses, fallback to Flask's stdlib encoder if not available
+try:
+    import orjson
+    from flask.json.provider import DefaultJSONProvider
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Try to import flask-compress for gzip/brotli responses, serve uncompressed if not available
+try:
+    from flask_compress import Compress
+    HAS_COMPRESS = True
+except ImportError:
+    HAS_COMPRESS = False
+
+if HAS_ORJSON:
+    class ORJSONProvider(DefaultJSONProvider):
+        """Flask JSON provider backed by orjson"""
+
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(
+                obj,
+                default=self.default,
+                option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            ).decode()
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
 app = Flask(__name__)
 CORS(app)  # Enable CORS for frontend communication
+if HAS_ORJSON:
+    app.json = ORJSONProvider(app)
+if HAS_COMPRESS:
+    app.config['COMPRESS_MIN_SIZE'] = 500
+    app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+    Compress(app)
+
+# Concurrent OpenAI calls per /api/generate-multiple request, bounded by the account's rate limits
+MAX_GENERATION_WORKERS = 5
+
+
+class GenerateBlogRequest(BaseModel):
+    """Body of /api/generate-blog"""
+    topic_id: Optional[int] = None
+    custom_topic: Optional[str] = None
+    selected_keywords: List[str] = Field(default_factory=list)
+
+
+class GenerateMultipleRequest(BaseModel):
+    """Body of /api/generate-multiple"""
+    count: int = Field(default=3, ge=1, le=10)  # Maximum 10 blogs per request
+    topic_ids: List[int] = Field(default_factory=list)
+
 
 # Global variables for data
 excel_reader = None
@@ -28,17 +76,58 @@ seo_keywords = None
 llm_keywords = None
 website_links = None
 key_topics = None
+key_topics_records = None
+# Keyword lists and prompt fragments shared by every blog, built once per load
+prompt_ctx = None
+
+# Response payloads derived from the spreadsheet, built once per load
+topics_cache = None
+keywords_cache = None
+
+
+def build_response_caches():
+    """Precompute the topic and keyword payloads served by the API and the shared prompt context"""
+    global topics_cache, keywords_cache, prompt_ctx
+
+    topics_list = [
+        {
+            'id': i,
+            'topic': row.get('Topic', 'Unknown'),
+            'description': row.get('Description', ''),
+            'source': row.get('Source & URL', '')
+        }
+        for i, row in enumerate(key_topics_records)
+    ]
+    topics_cache = {
+        'topics': topics_list,
+        'count': len(topics_list)
+    }
+
+    # Column names are the keyword categories
+    keywords_cache = {
+        'seo_keywords': {col: seo_keywords[col].dropna().tolist() for col in seo_keywords.columns},
+        'llm_keywords': {col: llm_keywords[col].dropna().tolist() for col in llm_keywords.columns}
+    }
+
+    prompt_ctx = blog_generator.build_prompt_context(seo_keywords, llm_keywords, website_links)
 
 
 def initialize_components():
     """Initialize all components once at startup"""
     global excel_reader, blog_generator, airtable_writer
-    global seo_keywords, llm_keywords, website_links, key_topics
+    global seo_keywords, llm_keywords, website_links, key_topics, key_topics_records
+
+    # Imported here so the pandas/openai import cost is only paid when components are built
+    from src.excel_reader import ExcelReader
+    from src.blog_generator import BlogGenerator
+    from airtable_blog_writer import AirtableBlogWriter
 
     try:
         # Initialize components
         excel_file = os.getenv('EXCEL_FILE_PATH', 'data/Key Insights.xlsx')
-        excel_reader = ExcelReader(excel_file)
+        # BLOG_AGENT_CACHE=1 reuses parsed sheets across restarts until the Excel file changes
+        cache_dir = '.cache' if os.getenv('BLOG_AGENT_CACHE') == '1' else None
+        excel_reader = ExcelReader(excel_file, cache_dir=cache_dir)
         blog_generator = BlogGenerator()
         airtable_writer = AirtableBlogWriter()
 
@@ -49,6 +138,9 @@ def initialize_components():
             llm_keywords = data['LLM - Keywords']
             website_links = data['Website']
             key_topics = data['key topics']
+            # Plain dicts are much cheaper to index and iterate than DataFrame rows
+            key_topics_records = key_topics.to_dict('records')
+            build_response_caches()
             return True
         return False
     except Exception as e:
@@ -66,70 +158,46 @@ def health_check():
     })
 
 
+@app.route('/api/reload', methods=['POST'])
+def reload_data():
+    """Reload the Excel data and rebuild cached payloads"""
+    if initialize_components():
+        return jsonify({'status': 'reloaded'})
+    return jsonify({'error': 'Failed to reload data'}), 500
+
+
 @app.route('/api/topics', methods=['GET'])
 def get_topics():
     """Get available topics for blog generation"""
-    try:
-        if key_topics is None:
-            return jsonify({'error': 'Data not loaded'}), 500
-
-        topics_list = []
-        for _, row in key_topics.iterrows():
-            topics_list.append({
-                'id': len(topics_list),
-                'topic': row.get('Topic', 'Unknown'),
-                'description': row.get('Description', ''),
-                'source': row.get('Source & URL', '')
-            })
-
-        return jsonify({
-            'topics': topics_list,
-            'count': len(topics_list)
-        })
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    if topics_cache is None:
+        return jsonify({'error': 'Data not loaded'}), 500
+    return jsonify(topics_cache)
 
 
 @app.route('/api/keywords', methods=['GET'])
 def get_keywords():
     """Get available keywords by category"""
-    try:
-        if seo_keywords is None or llm_keywords is None:
-            return jsonify({'error': 'Keywords not loaded'}), 500
-
-        # Get column names (categories)
-        seo_categories = {}
-        llm_categories = {}
-
-        # Process SEO keywords
-        for col in seo_keywords.columns:
-            seo_categories[col] = seo_keywords[col].dropna().tolist()
-
-        # Process LLM keywords
-        for col in llm_keywords.columns:
-            llm_categories[col] = llm_keywords[col].dropna().tolist()
-
-        return jsonify({
-            'seo_keywords': seo_categories,
-            'llm_keywords': llm_categories
-        })
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    if keywords_cache is None:
+        return jsonify({'error': 'Keywords not loaded'}), 500
+    return jsonify(keywords_cache)
 
 
 @app.route('/api/generate-blog', methods=['POST'])
 def generate_blog():
     """Generate a blog based on topic and selected keywords"""
     try:
-        data = request.get_json()
-
         # Validate input
-        if not data:
+        if not request.data:
             return jsonify({'error': 'No data provided'}), 400
 
-        topic_id = data.get('topic_id')
-        custom_topic = data.get('custom_topic')
-        selected_keywords = data.get('selected_keywords', [])
+        try:
+            req = GenerateBlogRequest.model_validate_json(request.data)
+        except ValidationError as e:
+            return jsonify({'error': str(e)}), 400
+
+        topic_id = req.topic_id
+        custom_topic = req.custom_topic
+        selected_keywords = req.selected_keywords
 
         # Determine topic data
         if custom_topic:
@@ -138,22 +206,13 @@ def generate_blog():
                 'Description': 'Custom topic provided by user',
                 'Source & URL': 'User input'
             }
-        elif topic_id is not None and topic_id < len(key_topics):
-            topic_data = key_topics.iloc[topic_id]
+        elif topic_id is not None and topic_id < len(key_topics_records):
+            topic_data = key_topics_records[topic_id]
         else:
             return jsonify({'error': 'Invalid topic selection'}), 400
 
-        # Test connections
-        if not blog_generator.test_connection():
-            return jsonify({'error': 'OpenAI connection failed'}), 500
-
         # Generate blog
-        result = blog_generator.generate_blog(
-            topic_data,
-            seo_keywords,
-            llm_keywords,
-            website_links
-        )
+        result = blog_generator.generate_blog_precomputed(topic_data, prompt_ctx)
 
         if result['status'] == 'success':
             # Save to Airtable
@@ -191,34 +250,41 @@ def generate_blog():
 def generate_multiple_blogs():
     """Generate multiple blogs"""
     try:
-        data = request.get_json()
-        count = data.get('count', 3)
-        topic_ids = data.get('topic_ids', [])
+        try:
+            req = GenerateMultipleRequest.model_validate_json(request.data)
+        except ValidationError as e:
+            return jsonify({'error': str(e)}), 400
 
-        if count > 10:
-            return jsonify({'error': 'Maximum 10 blogs per request'}), 400
+        count = req.count
+        topic_ids = req.topic_ids
 
         results = []
         total_cost = 0.0
+        successful = 0
 
         # Determine which topics to use
         if topic_ids:
-            topics_to_use = [key_topics.iloc[tid] for tid in topic_ids[:count]]
+            topics_to_use = [key_topics_records[tid] for tid in topic_ids[:count]]
         else:
-            topics_to_use = [key_topics.iloc[i] for i in range(min(count, len(key_topics)))]
+            topics_to_use = key_topics_records[:count]
+
+        # Generation is network-bound, so run the OpenAI calls on a thread pool
+        generated = [None] * len(topics_to_use)
+        with ThreadPoolExecutor(max_workers=MAX_GENERATION_WORKERS) as executor:
+            futures = {
+                executor.submit(blog_generator.generate_blog_precomputed, topic_data, prompt_ctx): i
+                for i, topic_data in enumerate(topics_to_use)
+            }
+            for future in as_completed(futures):
+                generated[futures[future]] = future.result()
 
-        for i, topic_data in enumerate(topics_to_use):
-            result = blog_generator.generate_blog(
-                topic_data,
-                seo_keywords,
-                llm_keywords,
-                website_links
-            )
+        # Save successful blogs to Airtable in batched requests
+        airtable_writer.write_multiple_blogs(generated)
 
+        for i, result in enumerate(generated):
             if result['status'] == 'success':
-                # Save to Airtable
-                airtable_writer.write_blog_to_airtable(result)
                 total_cost += result.get('cost', 0.0)
+                successful += 1
 
             results.append({
                 'index': i + 1,
@@ -230,8 +296,6 @@ def generate_multiple_blogs():
                 'error': result.get('error', '')
             })
 
-        successful = len([r for r in results if r['status'] == 'success'])
-
         return jsonify({
             'status': 'completed',
             'summary': {
@@ -265,6 +329,7 @@ def get_stats():
 
 
 if __name__ == '__main__':
+    # Development server only - use wsgi.py with gunicorn in production
     print("Starting Blog Generator API...")
 
     if initialize_components():
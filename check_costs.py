@@ -12,7 +12,8 @@ def check_blog_costs():
         return
 
     # Find blog files
-    blog_files = [f for f in os.listdir(blog_folder) if f.startswith('blog_') and f.endswith('.txt')]
+    blog_files = [entry.name for entry in os.scandir(blog_folder)
+                  if entry.name.startswith('blog_') and entry.name.endswith('.txt')]
 
     print(f"📁 Found {len(blog_files)} blog files")
 
@@ -23,21 +24,26 @@ def check_blog_costs():
 
         print(f"\n📄 Checking: {first_blog}")
 
+        # Read line by line and stop once the first 20 lines are seen and both markers found
+        lines = []
+        has_tokens = has_cost = False
         with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
+            for i, line in enumerate(f):
+                if i < 20:
+                    lines.append(line.rstrip('\n'))
+                if "Input Tokens:" in line:
+                    has_tokens = True
+                if "Cost:" in line:
+                    has_cost = True
+                if i >= 19 and has_tokens and has_cost:
+                    break
 
         # Show first 20 lines to see structure
-        lines = content.split('\n')[:20]
-
         print("📊 First 20 lines of blog file:")
         print("-" * 40)
         for i, line in enumerate(lines, 1):
             print(f"{i:2d}: {line}")
 
-        # Check if we have token/cost info
-        has_tokens = "Input Tokens:" in content
-        has_cost = "Cost:" in content
-
         print(f"\n🔍 Analysis:")
         print(f"Has token information: {'✅' if has_tokens else '❌'}")
         print(f"Has cost information: {'✅' if has_cost else '❌'}")
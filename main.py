@@ -1,32 +1,148 @@
 import os
 import sys
 import json
+import argparse
+import queue
+import asyncio
+import threading
+import time
+import hashlib
+import pathlib
+from dataclasses import dataclass
 from datetime import datetime
+from typing import Optional
 from dotenv import load_dotenv
 
-# Add the src directory to Python path
-sys.path.append('src')
+__all__ = ['EnhancedBlogGenerationPipeline', 'Config']
 
-# Import custom modules
-from src.excel_reader import ExcelReader
-from src.blog_generator import BlogGenerator
-from airtable_blog_writer import AirtableBlogWriter
+# Try to import orjson for faster summary dumps, fallback to stdlib json if not available
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Blogs generated at the same time, kept low to stay within OpenAI rate limits
+MAX_CONCURRENT_GENERATIONS = 5
+
+# Airtable accepts up to 10 records per create request
+AIRTABLE_BATCH_SIZE = 10
+
+# Seconds the Airtable worker waits for more finished blogs before sending a partial batch
+AIRTABLE_BATCH_WAIT = 2.0
+
+# Blogs generated when no count is given
+DEFAULT_NUM_BLOGS = 5
+
+# Where blog files and run summaries are written
+OUTPUT_DIR = 'generated_blogs'
+
+# Readable run summary, filled from the generation_summary dict
+SUMMARY_TEMPLATE = (
+    "ENHANCED BLOG GENERATION SUMMARY\n" + "=" * 50 + "\n\n"
+    "Generation Time: {generation_time}\n"
+    "Total Blogs Attempted: {total_blogs_attempted}\n"
+    "Successful: {successful_blogs}\n"
+    "Failed: {failed_blogs}\n"
+    "Reused from cache: {cached_blogs}\n\n"
+    "TOKEN USAGE AND COST ANALYSIS:\n" + "-" * 40 + "\n"
+    "Total Input Tokens: {total_input_tokens:,}\n"
+    "Total Output Tokens: {total_output_tokens:,}\n"
+    "Total Tokens Used: {total_tokens:,}\n"
+    "Total Cost: ${total_cost:.4f}\n"
+    "Average Cost per Blog: ${average_cost_per_blog:.4f}\n"
+    "Cost per 1,000 tokens: ${cost_per_1k_tokens:.4f}\n"
+)
+
+# Characters replaced when a topic is used in a file name
+_SAFE_TBL = str.maketrans({c: '_' for c in ' /\\:*?"<>|'})
+
+# Where parsed spreadsheets and generated blogs are cached between runs
+CACHE_DIR = '.cache'
+BLOG_CACHE_DIR = os.path.join(CACHE_DIR, 'blogs')
+
+
+def _digest(value):
+    """Stable short hash of a JSON-serializable value"""
+    encoded = json.dumps(value, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def _encode_json_line(value):
+    """Serialize a value as one UTF-8 JSON line"""
+    if HAS_ORJSON:
+        return orjson.dumps(value) + b"\n"
+    return json.dumps(value, ensure_ascii=False).encode('utf-8') + b"\n"
 
 
 class EnhancedBlogGenerationPipeline:
-    def __init__(self):
+    def __init__(self, use_cache=True):
         """Initialize the complete blog generation pipeline with token tracking and Airtable integration"""
+        # Imported here so the pandas/openai import cost is only paid when a pipeline is built
+        import requests
+        from requests.adapters import HTTPAdapter
+        from src.excel_reader import ExcelReader
+        from src.blog_generator import BlogGenerator
+        from airtable_blog_writer import AirtableBlogWriter
+
+        # One keep-alive connection pool shared by the OpenAI and Airtable clients
+        self._http = requests.Session()
+        self._http.mount('https://', HTTPAdapter(pool_connections=8, pool_maxsize=32))
+
         self.excel_file = os.getenv('EXCEL_FILE_PATH', 'data/Key Insights.xlsx')
-        self.excel_reader = ExcelReader(self.excel_file)
-        self.blog_generator = BlogGenerator()
-        self.airtable_writer = AirtableBlogWriter()
+        # BLOG_AGENT_CACHE=1 reuses parsed sheets between runs until the Excel file changes
+        cache_dir = CACHE_DIR if os.getenv('BLOG_AGENT_CACHE') == '1' else None
+        self.excel_reader = ExcelReader(self.excel_file, cache_dir=cache_dir)
+        self.blog_generator = BlogGenerator(http_session=self._http)
+        self.airtable_writer = AirtableBlogWriter(session=self._http)
+        self.use_cache = use_cache
+
+        self.out_dir = pathlib.Path(OUTPUT_DIR)
+        self.out_dir.mkdir(exist_ok=True)
+
+        # Full results, blog content included, are streamed to a results file per run as each blog
+        # finishes; only the per-blog summary fields stay in memory
         self.results = []
+        self.run_id = datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.results_file = self.out_dir / f"results_{self.run_id}.jsonl"
 
         # Token tracking totals
         self.total_input_tokens = 0
         self.total_output_tokens = 0
         self.total_cost = 0.0
 
+        # Summary aggregates, maintained as results are recorded
+        self._success_count = 0
+        self._fail_count = 0
+        self._cached_count = 0  # Successful blogs reused from the cache, already paid for and sent to Airtable
+
+        # Airtable writes run on a background worker so they overlap with file saving
+        self._airtable_q = queue.Queue()
+        threading.Thread(target=self._airtable_worker, daemon=True).start()
+
+    def _airtable_worker(self):
+        """Drain queued results into batched Airtable writes"""
+        while True:
+            batch = [self._airtable_q.get()]
+            # Blogs finish a few at a time, so hold the batch open briefly to send them in one request
+            deadline = time.monotonic() + AIRTABLE_BATCH_WAIT
+            while len(batch) < AIRTABLE_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._airtable_q.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                self.airtable_writer.write_blogs_batched(batch)
+            except Exception as e:
+                print(f"❌ Error writing to Airtable: {str(e)}")
+            finally:
+                for _ in batch:
+                    self._airtable_q.task_done()
+
     def load_data(self):
         """Load data from Excel file"""
         print("📊 Loading data from Excel...")
@@ -53,71 +169,273 @@ class EnhancedBlogGenerationPipeline:
         print("✅ Connections tested!")
         return True
 
-    def generate_blogs(self, num_blogs=None):
-        """Generate blogs with token tracking and Airtable integration"""
-        if not hasattr(self, 'key_topics'):
-            print("❌ No data loaded. Run load_data() first.")
-            return []
+    def _context_digest(self, prompt_ctx):
+        """Hash the keyword and link inputs shared by every blog in a run"""
+        return _digest([
+            prompt_ctx['seo_keywords'],
+            prompt_ctx['llm_keywords'],
+            prompt_ctx['link_records']
+        ])
+
+    def _blog_cache_file(self, topic_data, context_digest):
+        """Cache file for a blog generated from this topic and run context"""
+        return os.path.join(BLOG_CACHE_DIR, f"{_digest([topic_data, context_digest])}.json")
+
+    def _mark_reused(self, result):
+        """Copy of a result for another blog slot, flagged as reused when it is a successful blog"""
+        if result['status'] != 'success':
+            return dict(result)
+        # Nothing was spent on this run, so _record_result keeps it out of the token and cost totals;
+        # original_cost keeps what the blog cost when it was generated, for its file header
+        return dict(result, cost=0.0, cached=True, original_cost=result.get('original_cost', result.get('cost', 0.0)))
+
+    def _load_cached_blog(self, cache_file):
+        """Return a previously generated blog, or None on a cache miss"""
+        if not self.use_cache or not os.path.exists(cache_file):
+            return None
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                result = json.load(f)
+        except (OSError, ValueError) as e:
+            # A damaged cache entry is just a miss; the blog is generated again and the entry rewritten
+            print(f"⚠️ Ignoring unreadable cached blog {cache_file}: {str(e)}")
+            return None
+        return self._mark_reused(result)
+
+    def _store_cached_blog(self, cache_file, result):
+        """Save a successful blog so identical topics are not regenerated"""
+        if not self.use_cache or result['status'] != 'success':
+            return
+        os.makedirs(BLOG_CACHE_DIR, exist_ok=True)
+        # Write then rename so an interrupted run never leaves a truncated cache entry
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False)
+        os.replace(tmp_file, cache_file)
+
+    async def _reuse_generation(self, generation):
+        """Await a generation started for an earlier duplicate of the same topic"""
+        return self._mark_reused(await generation)
+
+    async def _generate_one(self, semaphore, i, topic_data, topic_name, num_blogs, prompt_ctx, context_digest):
+        """Generate a single blog, bounded by the shared semaphore"""
+        cache_file = self._blog_cache_file(topic_data, context_digest)
+        cached = self._load_cached_blog(cache_file)
+        if cached is not None:
+            return cached
+
+        async with semaphore:
+            print(f"\n📝 Blog {i + 1}/{num_blogs}: {topic_name}")
+            result = await self.blog_generator.agenerate_blog_precomputed(topic_data, prompt_ctx)
+
+        self._store_cached_blog(cache_file, result)
+        return result
 
+    def _select_topics(self, num_blogs):
+        """Pick the first num_blogs topics as (topic_data, topic_name) pairs"""
         total_topics = len(self.key_topics)
         if num_blogs is None:
             num_blogs = total_topics
         else:
-            num_blogs = min(num_blogs, total_topics)
+            # A negative count would make head() select every topic but the last few
+            num_blogs = max(0, min(num_blogs, total_topics))
 
         print(f"🤖 Generating {num_blogs} blogs with token tracking and Airtable integration...")
 
-        for i in range(num_blogs):
-            topic_data = self.key_topics.iloc[i]
-            topic_name = topic_data.get('Topic', 'Unknown')
-            print(f"\n📝 Blog {i + 1}/{num_blogs}: {topic_name}")
+        # load_data falls back to an empty list when the 'key topics' sheet is missing
+        if not num_blogs:
+            return []
 
-            result = self.blog_generator.generate_blog(
-                topic_data,
-                self.seo_keywords,
-                self.llm_keywords,
-                self.website_links
-            )
-
-            result['generated_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            result['blog_index'] = i + 1
-
-            if result['status'] == 'success':
-                self.total_input_tokens += result.get('input_tokens', 0)
-                self.total_output_tokens += result.get('output_tokens', 0)
-                self.total_cost += result.get('cost', 0.0)
-
-            self.results.append(result)
-
-            if result['status'] == 'success':
-                safe_topic = topic_name.replace(' ', '_').replace('/', '_')[:30]
-                filename = f"generated_blogs/blog_{i + 1:02d}_{safe_topic}.txt"
-                os.makedirs('generated_blogs', exist_ok=True)
-
-                with open(filename, 'w', encoding='utf-8') as f:
-                    f.write(f"BLOG GENERATION REPORT\n{'='*50}\n")
-                    f.write(f"Topic: {result['topic']}\n")
-                    f.write(f"Model Used: {result.get('model_used', 'Unknown')}\n")
-                    f.write(f"Input Tokens: {result.get('input_tokens', 0):,}\n")
-                    f.write(f"Output Tokens: {result.get('output_tokens', 0):,}\n")
-                    f.write(f"Total Tokens: {result.get('total_tokens', 0):,}\n")
-                    f.write(f"Cost: ${result.get('cost', 0.0):.4f}\n")
-                    f.write(f"Word Count: {result['word_count']}\n")
-                    f.write(f"Generated: {result['generated_at']}\n")
-                    f.write(f"SEO Keywords: {', '.join(result.get('seo_keywords_used', []))}\n")
-                    f.write(f"LLM Keywords: {', '.join(result.get('llm_keywords_used', []))}\n")
-                    f.write(f"Links Used: {', '.join(result.get('links_used', []))}\n")
-                    f.write("\n" + "="*50 + "\n\n")
-                    f.write(result['content'])
-
-                print(f"💾 Saved to file: {filename}")
-                print(f"📊 Tokens: {result.get('total_tokens', 0):,} | Cost: ${result.get('cost', 0.0):.4f}")
-
-                print("📤 Saving to Airtable...")
-                self.airtable_writer.write_blog_to_airtable(result)
+        # Plain dicts avoid building a Series per row and pickle cleanly for the async and batch paths
+        records = self.key_topics.head(num_blogs).to_dict('records')
+        return [(topic_data, topic_data.get('Topic', 'Unknown')) for topic_data in records]
+
+    async def generate_blogs(self, num_blogs=None):
+        """Generate blogs concurrently with token tracking and Airtable integration"""
+        if not hasattr(self, 'key_topics'):
+            print("❌ No data loaded. Run load_data() first.")
+            return []
+
+        topics = self._select_topics(num_blogs)
+        num_blogs = len(topics)
+
+        # Keyword lists and prompt fragments are the same for every blog, so build them once
+        prompt_ctx = self.blog_generator.build_prompt_context(self.seo_keywords, self.llm_keywords, self.website_links)
+        context_digest = self._context_digest(prompt_ctx)
+
+        # Blogs are recorded as they finish, but share one timestamp for the run
+        generated_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+        # LLM calls are network-bound, so overlap them up to the rate-limit friendly cap
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_GENERATIONS)
+        with open(self.results_file, 'ab') as results_fp:
+            async with self.blog_generator.async_session():
+                # Duplicate topics share the first occurrence's generation instead of each calling the API
+                generations = {}
+                pending = []
+                for i, (topic_data, topic_name) in enumerate(topics):
+                    key = self._blog_cache_file(topic_data, context_digest)
+                    if key in generations:
+                        generation = self._reuse_generation(generations[key])
+                    else:
+                        generation = generations[key] = asyncio.ensure_future(self._generate_one(
+                            semaphore, i, topic_data, topic_name, num_blogs, prompt_ctx, context_digest
+                        ))
+                    pending.append(self._record_when_done(generation, i, topic_name, generated_at, results_fp))
+                # Each recorder holds the generation it needs; the map would keep every finished blog alive
+                generations.clear()
+                summaries = await asyncio.gather(*pending)
+
+        return self._finish_run(summaries)
+
+    def generate_blogs_batch(self, num_blogs=None):
+        """Generate blogs through the OpenAI Batch API - cheaper, but can take up to 24 hours"""
+        if not hasattr(self, 'key_topics'):
+            print("❌ No data loaded. Run load_data() first.")
+            return []
+
+        topics = self._select_topics(num_blogs)
+        prompt_ctx = self.blog_generator.build_prompt_context(self.seo_keywords, self.llm_keywords, self.website_links)
+        context_digest = self._context_digest(prompt_ctx)
+
+        generated_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        cache_files = [self._blog_cache_file(topic_data, context_digest) for topic_data, _ in topics]
+        summaries = [None] * len(topics)
+
+        with open(self.results_file, 'ab') as results_fp:
+            # Cached blogs are recorded straight away; each other distinct topic is sent to the batch once
+            first_index = {}
+            duplicates = []
+            for i, (_, topic_name) in enumerate(topics):
+                cached = self._load_cached_blog(cache_files[i])
+                if cached is not None:
+                    summaries[i] = self._record_result(i, topic_name, cached, generated_at, results_fp)
+                elif cache_files[i] in first_index:
+                    duplicates.append(i)
+                else:
+                    first_index[cache_files[i]] = i
+            pending = list(first_index.values())
+
+            # Results are recorded one at a time as the batch hands them out; only those a duplicate
+            # still needs are kept
+            reused_keys = {cache_files[i] for i in duplicates}
+            kept = {}
+            if pending:
+                batch_results = self.blog_generator.iter_blogs_batch(
+                    [topics[i][0] for i in pending],
+                    self.seo_keywords,
+                    self.llm_keywords,
+                    self.website_links
+                )
+                for i, result in zip(pending, batch_results):
+                    self._store_cached_blog(cache_files[i], result)
+                    if cache_files[i] in reused_keys:
+                        kept[cache_files[i]] = result
+                    summaries[i] = self._record_result(i, topics[i][1], result, generated_at, results_fp)
+
+            # Later duplicates reuse the blog generated for their first occurrence
+            for i in duplicates:
+                reused = self._mark_reused(kept[cache_files[i]])
+                summaries[i] = self._record_result(i, topics[i][1], reused, generated_at, results_fp)
+
+        return self._finish_run(summaries)
+
+    def _blog_report(self, result, generated_at):
+        """Text of a blog file: the token and cost header followed by the blog content"""
+        return ''.join([
+            f"BLOG GENERATION REPORT\n{'='*50}\n",
+            f"Topic: {result['topic']}\n",
+            f"Model Used: {result.get('model_used', 'Unknown')}\n",
+            f"Input Tokens: {result.get('input_tokens', 0):,}\n",
+            f"Output Tokens: {result.get('output_tokens', 0):,}\n",
+            f"Total Tokens: {result.get('total_tokens', 0):,}\n",
+            f"Cost: ${result.get('original_cost', result.get('cost', 0.0)):.4f}\n",
+            f"Word Count: {result['word_count']}\n",
+            f"Generated: {generated_at}\n",
+            f"SEO Keywords: {', '.join(result.get('seo_keywords_used', []))}\n",
+            f"LLM Keywords: {', '.join(result.get('llm_keywords_used', []))}\n",
+            f"Links Used: {', '.join(result.get('links_used', []))}\n",
+            "\n" + "="*50 + "\n\n",
+            result['content'],
+        ])
+
+    async def _record_when_done(self, generation, i, topic_name, generated_at, results_fp):
+        """Record a blog as soon as its generation finishes, keeping only its summary"""
+        return self._record_result(i, topic_name, await generation, generated_at, results_fp)
+
+    def _record_result(self, i, topic_name, result, generated_at, results_fp):
+        """Track totals, stream the full result to the results file, save the blog to a file and queue it
+        for Airtable; returns the per-blog summary kept in memory"""
+        result['generated_at'] = generated_at
+        result['blog_index'] = i + 1
+
+        status = result['status']
+        cached = result.get('cached', False)
+        input_tokens = result.get('input_tokens', 0)
+        output_tokens = result.get('output_tokens', 0)
+        cost = result.get('cost', 0.0)
+
+        if status == 'success':
+            self._success_count += 1
+            if cached:
+                # Tokens were spent on an earlier run; counting them here would skew cost per 1k tokens
+                self._cached_count += 1
             else:
-                print(f"❌ Failed: {result.get('error', 'Unknown error')}")
+                self.total_input_tokens += input_tokens
+                self.total_output_tokens += output_tokens
+                self.total_cost += cost
+        elif status == 'failed':
+            self._fail_count += 1
+
+        # Reused blogs were streamed when they were generated
+        if not cached:
+            results_fp.write(_encode_json_line(result))
+
+        summary = {
+            'topic': result.get('topic', 'Unknown'),
+            'word_count': result.get('word_count', 0),
+            'status': status,
+            'model_used': result.get('model_used', 'Unknown'),
+            'input_tokens': input_tokens,
+            'output_tokens': output_tokens,
+            'total_tokens': result.get('total_tokens', 0),
+            'cost': cost,
+            'seo_keywords_used': result.get('seo_keywords_used', []),
+            'llm_keywords_used': result.get('llm_keywords_used', []),
+            'links_used': result.get('links_used', []),
+            'generated_at': generated_at,
+            'cached': cached,
+            'error': result.get('error', '')
+        }
+
+        if status != 'success':
+            print(f"❌ Failed: {result.get('error', 'Unknown error')}")
+            return summary
+
+        safe_topic = topic_name.translate(_SAFE_TBL)[:30]
+        filename = self.out_dir / f"blog_{i + 1:02d}_{safe_topic}.txt"
+
+        if cached:
+            # Already saved and sent to Airtable when it was generated; only restore a missing file
+            if not filename.exists():
+                filename.write_text(self._blog_report(result, generated_at), encoding='utf-8')
+            print(f"♻️ Reused cached blog: {topic_name} (not re-sent to Airtable)")
+            return summary
 
+        with open(filename, 'w', encoding='utf-8', buffering=1 << 16) as f:
+            f.write(self._blog_report(result, generated_at))
+
+        print(f"💾 Saved to file: {filename}")
+        print(f"📊 Tokens: {result.get('total_tokens', 0):,} | Cost: ${cost:.4f}")
+
+        print("📤 Queued for Airtable...")
+        self._airtable_q.put(result)
+        return summary
+
+    def _finish_run(self, summaries):
+        """Keep the run's per-blog summaries in topic order and wait for queued Airtable writes"""
+        self.results.extend(summaries)
+        self._airtable_q.join()
         return self.results
 
     def save_enhanced_summary(self):
@@ -126,68 +444,57 @@ class EnhancedBlogGenerationPipeline:
             print("❌ No results to save")
             return
 
-        successful_blogs = [r for r in self.results if r['status'] == 'success']
-        failed_blogs = [r for r in self.results if r['status'] == 'failed']
+        now = datetime.now()
+        stamp = now.strftime('%Y%m%d_%H%M%S')
+
+        total_tokens = self.total_input_tokens + self.total_output_tokens
+        # Only blogs generated on this run cost anything
+        generated_count = self._success_count - self._cached_count
+        average_cost = self.total_cost / generated_count if generated_count else 0
+        cost_per_1k = self.total_cost * 1000 / total_tokens if total_tokens else 0
 
         summary = {
             'generation_summary': {
                 'total_blogs_attempted': len(self.results),
-                'successful_blogs': len(successful_blogs),
-                'failed_blogs': len(failed_blogs),
-                'generation_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'successful_blogs': self._success_count,
+                'failed_blogs': self._fail_count,
+                'cached_blogs': self._cached_count,
+                'generation_time': now.strftime('%Y-%m-%d %H:%M:%S'),
                 'total_input_tokens': self.total_input_tokens,
                 'total_output_tokens': self.total_output_tokens,
-                'total_tokens': self.total_input_tokens + self.total_output_tokens,
+                'total_tokens': total_tokens,
                 'total_cost': round(self.total_cost, 4),
-                'average_cost_per_blog': round(self.total_cost / len(successful_blogs), 4) if successful_blogs else 0,
-                'cost_per_1k_tokens': round((self.total_cost * 1000 / (self.total_input_tokens + self.total_output_tokens)), 4) if (self.total_input_tokens + self.total_output_tokens) > 0 else 0
+                'average_cost_per_blog': round(average_cost, 4),
+                'cost_per_1k_tokens': round(cost_per_1k, 4)
             },
-            'blog_details': []
+            'blog_details': self.results
         }
 
-        for result in self.results:
-            blog_summary = {
-                'topic': result.get('topic', 'Unknown'),
-                'word_count': result.get('word_count', 0),
-                'status': result.get('status', 'unknown'),
-                'model_used': result.get('model_used', 'Unknown'),
-                'input_tokens': result.get('input_tokens', 0),
-                'output_tokens': result.get('output_tokens', 0),
-                'total_tokens': result.get('total_tokens', 0),
-                'cost': result.get('cost', 0.0),
-                'seo_keywords_used': result.get('seo_keywords_used', []),
-                'llm_keywords_used': result.get('llm_keywords_used', []),
-                'links_used': result.get('links_used', []),
-                'generated_at': result.get('generated_at', ''),
-                'error': result.get('error', '')
-            }
-            summary['blog_details'].append(blog_summary)
-
         # Save JSON summary
-        summary_file = f"generated_blogs/ENHANCED_SUMMARY_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(summary_file, 'w', encoding='utf-8') as f:
-            json.dump(summary, f, indent=2, ensure_ascii=False)
+        summary_file = self.out_dir / f"ENHANCED_SUMMARY_{stamp}.json"
+        if HAS_ORJSON:
+            with open(summary_file, 'wb') as f:
+                f.write(orjson.dumps(summary, option=orjson.OPT_INDENT_2))
+        else:
+            with open(summary_file, 'w', encoding='utf-8') as f:
+                json.dump(summary, f, indent=2, ensure_ascii=False)
 
         # Save readable text summary
-        text_summary_file = f"generated_blogs/SUMMARY_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
-        with open(text_summary_file, 'w', encoding='utf-8') as f:
-            f.write("ENHANCED BLOG GENERATION SUMMARY\n" + "="*50 + "\n\n")
-            f.write(f"Generation Time: {summary['generation_summary']['generation_time']}\n")
-            f.write(f"Total Blogs Attempted: {summary['generation_summary']['total_blogs_attempted']}\n")
-            f.write(f"Successful: {summary['generation_summary']['successful_blogs']}\n")
-            f.write(f"Failed: {summary['generation_summary']['failed_blogs']}\n\n")
-            f.write("TOKEN USAGE AND COST ANALYSIS:\n" + "-"*40 + "\n")
-            f.write(f"Total Input Tokens: {summary['generation_summary']['total_input_tokens']:,}\n")
-            f.write(f"Total Output Tokens: {summary['generation_summary']['total_output_tokens']:,}\n")
-            f.write(f"Total Tokens Used: {summary['generation_summary']['total_tokens']:,}\n")
-            f.write(f"Total Cost: ${summary['generation_summary']['total_cost']:.4f}\n")
-            f.write(f"Average Cost per Blog: ${summary['generation_summary']['average_cost_per_blog']:.4f}\n")
-            f.write(f"Cost per 1,000 tokens: ${summary['generation_summary']['cost_per_1k_tokens']:.4f}\n")
+        text_summary_file = self.out_dir / f"SUMMARY_{stamp}.txt"
+        with open(text_summary_file, 'w', encoding='utf-8', buffering=1 << 16) as f:
+            f.write(SUMMARY_TEMPLATE.format(**summary['generation_summary']))
         print(f"📊 Enhanced summary saved to: {text_summary_file}")
         print(f"📄 JSON data saved to: {summary_file}")
 
     def run_complete_pipeline(self, num_blogs=5):
         """Run the complete pipeline"""
+        try:
+            return self._run_pipeline(num_blogs)
+        finally:
+            self._http.close()
+
+    def _run_pipeline(self, num_blogs):
+        """Load data, generate blogs and save the summary"""
         print("🚀 Enhanced Blog Generation Pipeline with Token Tracking & Airtable")
         print("="*70)
 
@@ -199,59 +506,101 @@ class EnhancedBlogGenerationPipeline:
             print("❌ Pipeline failed at connection testing")
             return False
 
-        results = self.generate_blogs(num_blogs)
+        if num_blogs is None:
+            # Bulk runs don't need results immediately, so use the discounted Batch API
+            results = self.generate_blogs_batch()
+        else:
+            results = asyncio.run(self.generate_blogs(num_blogs))
         self.save_enhanced_summary()
 
-        successful = len([r for r in results if r['status'] == 'success'])
+        successful = sum(1 for r in results if r['status'] == 'success')
         print(f"\n🎉 Pipeline Complete!")
         print(f"✅ Successfully generated {successful}/{len(results)} blogs")
         print(f"📊 Total Input Tokens: {self.total_input_tokens:,}")
         print(f"📊 Total Output Tokens: {self.total_output_tokens:,}")
         print(f"📊 Total Tokens Used: {self.total_input_tokens + self.total_output_tokens:,}")
         print(f"💰 Total Cost: ${self.total_cost:.4f}")
-        if successful > 0:
-            avg_cost = self.total_cost / successful
+        if self._cached_count:
+            print(f"♻️ Reused from cache: {self._cached_count} blogs (no cost, not re-sent to Airtable)")
+        generated_count = successful - self._cached_count
+        if generated_count > 0:
+            avg_cost = self.total_cost / generated_count
             print(f"💰 Average Cost per Blog: ${avg_cost:.4f}")
-        print(f"📁 Blogs saved to files: generated_blogs/ folder")
+        print(f"📁 Blogs saved to files: {self.out_dir}/ folder")
         print(f"📤 Blogs saved to Airtable: Check your Airtable base")
         return True
 
 
-if __name__ == "__main__":
-    # Load .env
-    load_dotenv()
+def _positive_int(value):
+    """argparse type for a blog count of at least 1"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
 
-    # Detect CI/CD / non-interactive
-    IS_CI = os.getenv("GITHUB_ACTIONS") == "true" or not sys.stdin.isatty()
-
-    if IS_CI:
-        choice = "3"  # Default to 5 blogs
-        print(f"⚙️  Non-interactive environment detected. Auto-selecting default: {choice}")
-    else:
-        print("Choose an option:")
-        print("1. Generate 1 test blog")
-        print("2. Generate 3 blogs")
-        print("3. Generate 5 blogs (default)")
-        print("4. Generate all blogs from your Excel file")
-        print("5. Custom number")
-        try:
-            choice = input("\nEnter choice (1-5) or press Enter for default: ").strip()
-        except EOFError:
-            choice = "3"
+
+def _prompt_num_blogs():
+    """Ask how many blogs to generate on an interactive terminal"""
+    print("Choose an option:")
+    print("1. Generate 1 test blog")
+    print("2. Generate 3 blogs")
+    print("3. Generate 5 blogs (default)")
+    print("4. Generate all blogs from your Excel file (OpenAI Batch API, half price, up to 24h)")
+    print("5. Custom number")
+    try:
+        choice = input("\nEnter choice (1-5) or press Enter for default: ").strip()
+    except EOFError:
+        choice = "3"
 
     if choice == "1":
-        num_blogs = 1
+        return 1
     elif choice == "2":
-        num_blogs = 3
+        return 3
     elif choice == "4":
-        num_blogs = None
+        return None
     elif choice == "5":
         try:
-            num_blogs = int(input("How many blogs to generate? "))
-        except:
-            num_blogs = 5
-    else:
-        num_blogs = 5
-
-    pipeline = EnhancedBlogGenerationPipeline()
-    pipeline.run_complete_pipeline(num_blogs)
+            return int(input("How many blogs to generate? "))
+        except (ValueError, EOFError):
+            return DEFAULT_NUM_BLOGS
+    return DEFAULT_NUM_BLOGS
+
+
+@dataclass(frozen=True)
+class Config:
+    """Pipeline run options parsed from the command line"""
+    num_blogs: Optional[int] = DEFAULT_NUM_BLOGS
+    use_cache: bool = True
+
+    @classmethod
+    def parse_args(cls, argv=None):
+        """Build a Config from command line arguments, prompting only on an interactive terminal"""
+        parser = argparse.ArgumentParser(description="Generate SEO blogs from the Key Insights spreadsheet")
+        count = parser.add_mutually_exclusive_group()
+        count.add_argument('--num', type=_positive_int, help=f"number of blogs to generate (default {DEFAULT_NUM_BLOGS})")
+        count.add_argument('--all', action='store_true',
+                           help="generate every topic through the OpenAI Batch API (half price, up to 24h)")
+        parser.add_argument('--ci', action='store_true', help="never prompt, use the default blog count")
+        parser.add_argument('--no-cache', action='store_true', help="regenerate blogs even if a cached copy exists")
+        args = parser.parse_args(argv)
+
+        if args.all:
+            num_blogs = None
+        elif args.num is not None:
+            num_blogs = args.num
+        elif args.ci or os.getenv("GITHUB_ACTIONS") == "true" or not sys.stdin.isatty():
+            num_blogs = DEFAULT_NUM_BLOGS
+            print(f"⚙️  Non-interactive environment detected. Generating {num_blogs} blogs")
+        else:
+            num_blogs = _prompt_num_blogs()
+
+        return cls(num_blogs=num_blogs, use_cache=not args.no_cache)
+
+
+if __name__ == "__main__":
+    # Load .env
+    load_dotenv()
+
+    cfg = Config.parse_args()
+    pipeline = EnhancedBlogGenerationPipeline(use_cache=cfg.use_cache)
+    pipeline.run_complete_pipeline(cfg.num_blogs)
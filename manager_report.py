@@ -1,5 +1,69 @@
 import os
-import re
+from datetime import datetime
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+# Header fields written at the top of each generated blog file, as label -> (field, parser)
+_HEADER_FIELDS = {
+    'Topic': ('topic', str),
+    'Input Tokens': ('input_tokens', lambda value: int(value.replace(',', ''))),
+    'Output Tokens': ('output_tokens', lambda value: int(value.replace(',', ''))),
+    'Cost': ('cost', lambda value: float(value.lstrip('$'))),
+    'Word Count': ('word_count', int),
+    'Model Used': ('model', str),
+}
+
+# Upper bound on header lines read when a blog file has no blank separator
+HEADER_MAX_LINES = 20
+
+# Blog files parsed at the same time; the work is small reads, so threads overlap the I/O
+MAX_PARSE_WORKERS = 8
+
+
+def _parse_blog_header(lines):
+    """Parse the 'Key: value' metadata lines before the first blank line of a blog file"""
+    fields = {}
+    for line in islice(lines, HEADER_MAX_LINES):
+        line = line.rstrip('\n')
+        if not line.strip():
+            break
+        label, _, value = line.partition(': ')
+        if label in _HEADER_FIELDS:
+            field, parse = _HEADER_FIELDS[label]
+            try:
+                fields.setdefault(field, parse(value))
+            except ValueError:
+                continue
+    return fields
+
+
+def _blog_sort_key(name):
+    """Order blog_<n>_<topic>.txt files by their numeric blog index, then by name"""
+    index = name[len('blog_'):].partition('_')[0]
+    return (int(index) if index.isdigit() else float('inf'), name)
+
+
+def _parse_blog(filepath):
+    """Read one blog file's header into a report row, or None if it lacks token data"""
+    # Stop at the end of the header instead of loading the whole blog body
+    with open(filepath, 'r', encoding='utf-8') as f:
+        fields = _parse_blog_header(f)
+
+    if not all(key in fields for key in ('topic', 'input_tokens', 'output_tokens', 'cost')):
+        return None
+
+    input_tokens = fields['input_tokens']
+    output_tokens = fields['output_tokens']
+    return {
+        'topic': fields['topic'],
+        'input_tokens': input_tokens,
+        'output_tokens': output_tokens,
+        'total_tokens': input_tokens + output_tokens,
+        'cost': fields['cost'],
+        'word_count': fields.get('word_count', 0),
+        'model': fields.get('model', "Unknown")
+    }
 
 
 def create_manager_report():
@@ -11,64 +75,39 @@ def create_manager_report():
         print("❌ Please generate blogs first using: python main.py")
         return
 
-    # Find all blog files
-    blog_files = [f for f in os.listdir(blog_folder) if f.startswith('blog_') and f.endswith('.txt')]
+    # Find all blog files in one directory pass, in blog index order
+    blog_files = sorted(
+        (entry for entry in os.scandir(blog_folder) if entry.name.startswith('blog_') and entry.name.endswith('.txt')),
+        key=lambda entry: _blog_sort_key(entry.name)
+    )
 
     if not blog_files:
         print("❌ No blog files found")
         return
 
-    # Analyze all blogs
-    total_input_tokens = 0
-    total_output_tokens = 0
-    total_cost = 0.0
-    blog_data = []
-
     print("📊 MANAGER REPORT - TOKEN USAGE AND COSTS")
     print("=" * 60)
 
-    for filename in sorted(blog_files):
-        filepath = os.path.join(blog_folder, filename)
-
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Extract data
-        topic_match = re.search(r'Topic: (.+)', content)
-        input_tokens_match = re.search(r'Input Tokens: ([\d,]+)', content)
-        output_tokens_match = re.search(r'Output Tokens: ([\d,]+)', content)
-        cost_match = re.search(r'Cost: \$([\d.]+)', content)
-        word_count_match = re.search(r'Word Count: (\d+)', content)
-        model_match = re.search(r'Model Used: (.+)', content)
-
-        if all([topic_match, input_tokens_match, output_tokens_match, cost_match]):
-            topic = topic_match.group(1)
-            input_tokens = int(input_tokens_match.group(1).replace(',', ''))
-            output_tokens = int(output_tokens_match.group(1).replace(',', ''))
-            cost = float(cost_match.group(1))
-            word_count = int(word_count_match.group(1)) if word_count_match else 0
-            model = model_match.group(1) if model_match else "Unknown"
-
-            total_input_tokens += input_tokens
-            total_output_tokens += output_tokens
-            total_cost += cost
-
-            blog_data.append({
-                'topic': topic,
-                'input_tokens': input_tokens,
-                'output_tokens': output_tokens,
-                'total_tokens': input_tokens + output_tokens,
-                'cost': cost,
-                'word_count': word_count,
-                'model': model
-            })
+    # Analyze all blogs, keeping blog order in the results
+    with ThreadPoolExecutor(max_workers=MAX_PARSE_WORKERS) as executor:
+        blog_data = [blog for blog in executor.map(_parse_blog, (entry.path for entry in blog_files)) if blog is not None]
+
+    if not blog_data:
+        print("❌ No blog files with token data found")
+        return
+
+    total_input_tokens = sum(blog['input_tokens'] for blog in blog_data)
+    total_output_tokens = sum(blog['output_tokens'] for blog in blog_data)
+    total_cost = sum(blog['cost'] for blog in blog_data)
 
     # Show summary
     blog_count = len(blog_data)
     total_tokens = total_input_tokens + total_output_tokens
-    avg_cost_per_blog = total_cost / blog_count if blog_count > 0 else 0
+    avg_cost_per_blog = total_cost / blog_count
+    cost_per_1k = total_cost * 1000 / total_tokens if total_tokens else 0.0
+    report_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
-    print(f"📅 Report Date: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"📅 Report Date: {report_date}")
     print(f"🤖 Model Used: {blog_data[0]['model'] if blog_data else 'Unknown'}")
     print(f"📝 Total Blogs Generated: {blog_count}")
     print(f"📊 Total Input Tokens: {total_input_tokens:,}")
@@ -76,50 +115,57 @@ def create_manager_report():
     print(f"📊 Total Tokens Used: {total_tokens:,}")
     print(f"💰 Total Cost: ${total_cost:.4f}")
     print(f"💰 Average Cost per Blog: ${avg_cost_per_blog:.4f}")
-    print(f"💰 Cost per 1,000 tokens: ${(total_cost * 1000 / total_tokens):.4f}")
+    print(f"💰 Cost per 1,000 tokens: ${cost_per_1k:.4f}")
 
     print(f"\n📋 INDIVIDUAL BLOG BREAKDOWN:")
     print("-" * 80)
     print(f"{'#':<3} {'Topic':<35} {'Tokens':<8} {'Words':<6} {'Cost':<8}")
     print("-" * 80)
 
+    lines = []
     for i, blog in enumerate(blog_data, 1):
-        topic_short = blog['topic'][:34] + "..." if len(blog['topic']) > 34 else blog['topic']
-        print(f"{i:<3} {topic_short:<35} {blog['total_tokens']:<8,} {blog['word_count']:<6} ${blog['cost']:<7.4f}")
+        topic = blog['topic']
+        topic_short = f"{topic:.34}..." if len(topic) > 34 else topic
+        lines.append(f"{i:<3} {topic_short:<35} {blog['total_tokens']:<8,} {blog['word_count']:<6} ${blog['cost']:<7.4f}")
+    print("\n".join(lines))
 
     # Save detailed report
-    with open('MANAGER_REPORT.txt', 'w', encoding='utf-8') as f:
-        f.write("BLOG GENERATION - TOKEN USAGE AND COST REPORT\n")
-        f.write("=" * 60 + "\n\n")
-        f.write(f"Report Generated: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        f.write(f"Project: Blog Generation Agent\n")
-        f.write(f"Developer: Sandeep\n\n")
-
-        f.write("SUMMARY:\n")
-        f.write("-" * 30 + "\n")
-        f.write(f"Model Used: {blog_data[0]['model'] if blog_data else 'Unknown'}\n")
-        f.write(f"Total Blogs: {blog_count}\n")
-        f.write(f"Total Input Tokens: {total_input_tokens:,}\n")
-        f.write(f"Total Output Tokens: {total_output_tokens:,}\n")
-        f.write(f"Total Tokens: {total_tokens:,}\n")
-        f.write(f"Total Cost: ${total_cost:.4f}\n")
-        f.write(f"Average Cost per Blog: ${avg_cost_per_blog:.4f}\n")
-        f.write(f"Cost per 1,000 tokens: ${(total_cost * 1000 / total_tokens):.4f}\n\n")
-
-        f.write("PRICING BREAKDOWN:\n")
-        f.write("-" * 30 + "\n")
-        f.write(f"Input Token Cost (${0.005}/1K): ${total_input_tokens * 0.005 / 1000:.4f}\n")
-        f.write(f"Output Token Cost (${0.015}/1K): ${total_output_tokens * 0.015 / 1000:.4f}\n\n")
-
-        f.write("INDIVIDUAL BLOG DETAILS:\n")
-        f.write("-" * 30 + "\n")
-        for i, blog in enumerate(blog_data, 1):
-            f.write(f"\nBlog {i}: {blog['topic']}\n")
-            f.write(f"  Input Tokens: {blog['input_tokens']:,}\n")
-            f.write(f"  Output Tokens: {blog['output_tokens']:,}\n")
-            f.write(f"  Total Tokens: {blog['total_tokens']:,}\n")
-            f.write(f"  Word Count: {blog['word_count']}\n")
-            f.write(f"  Cost: ${blog['cost']:.4f}\n")
+    out = [
+        "BLOG GENERATION - TOKEN USAGE AND COST REPORT\n",
+        "=" * 60 + "\n\n",
+        f"Report Generated: {report_date}\n",
+        f"Project: Blog Generation Agent\n",
+        f"Developer: Sandeep\n\n",
+
+        "SUMMARY:\n",
+        "-" * 30 + "\n",
+        f"Model Used: {blog_data[0]['model'] if blog_data else 'Unknown'}\n",
+        f"Total Blogs: {blog_count}\n",
+        f"Total Input Tokens: {total_input_tokens:,}\n",
+        f"Total Output Tokens: {total_output_tokens:,}\n",
+        f"Total Tokens: {total_tokens:,}\n",
+        f"Total Cost: ${total_cost:.4f}\n",
+        f"Average Cost per Blog: ${avg_cost_per_blog:.4f}\n",
+        f"Cost per 1,000 tokens: ${cost_per_1k:.4f}\n\n",
+
+        "PRICING BREAKDOWN:\n",
+        "-" * 30 + "\n",
+        f"Input Token Cost (${0.005}/1K): ${total_input_tokens * 0.005 / 1000:.4f}\n",
+        f"Output Token Cost (${0.015}/1K): ${total_output_tokens * 0.015 / 1000:.4f}\n\n",
+
+        "INDIVIDUAL BLOG DETAILS:\n",
+        "-" * 30 + "\n",
+    ]
+    for i, blog in enumerate(blog_data, 1):
+        out.append(
+            f"\nBlog {i}: {blog['topic']}\n"
+            f"  Input Tokens: {blog['input_tokens']:,}\n"
+            f"  Output Tokens: {blog['output_tokens']:,}\n"
+            f"  Total Tokens: {blog['total_tokens']:,}\n"
+            f"  Word Count: {blog['word_count']}\n"
+            f"  Cost: ${blog['cost']:.4f}\n"
+        )
+    Path('MANAGER_REPORT.txt').write_text(''.join(out), encoding='utf-8')
 
     print(f"\n💾 Detailed report saved to: MANAGER_REPORT.txt")
     print(f"\n🎯 KEY INSIGHTS FOR MANAGER:")
@@ -130,7 +176,5 @@ def create_manager_report():
 
 
 if __name__ == "__main__":
-    import pandas as pd
-
     print("🚀 Creating Manager Report...")
     create_manager_report()
\ No newline at end of file
@@ -1,5 +1,12 @@
 import os
+import json
+import time
+import asyncio
+import threading
+import contextlib
+import aiohttp
 import openai
+import requests
 import pandas as pd
 from dotenv import load_dotenv
 import random
@@ -15,62 +22,24 @@ except ImportError:
     HAS_TIKTOKEN = False
     print("⚠️ tiktoken not installed. Install with: pip install tiktoken")
 
+# Models tried in order until one succeeds
+MODELS_TO_TRY = ["gpt-4o", "gpt-3.5-turbo"]
 
-class BlogGenerator:
-    def __init__(self):
-        """Initialize the blog generator with OpenAI API"""
-        openai.api_key = os.getenv('OPENAI_API_KEY')
-
-        # Token tracking variables
-        self.total_input_tokens = 0
-        self.total_output_tokens = 0
-        self.total_cost = 0.0
-
-        # GPT pricing (as of 2024)
-        self.pricing = {
-            'gpt-4o': {
-                'input': 0.005 / 1000,
-                'output': 0.015 / 1000
-            },
-            'gpt-3.5-turbo': {
-                'input': 0.0005 / 1000,
-                'output': 0.0015 / 1000
-            }
-        }
-
-    def count_tokens(self, text, model="gpt-4o"):
-        """Count tokens in text"""
-        if HAS_TIKTOKEN:
-            try:
-                encoding = tiktoken.encoding_for_model(model)
-                return len(encoding.encode(text))
-            except:
-                pass
-        return len(text) // 4
+# Batch API settings - batched requests are billed at half the real-time token price
+OPENAI_API_BASE = "https://api.openai.com/v1"
+BATCH_MODEL = "gpt-4o"
+BATCH_PRICE_FACTOR = 0.5
+BATCH_POLL_INTERVAL = 60
+BATCH_TERMINAL_STATUSES = {'completed', 'failed', 'expired', 'cancelled'}
 
-    def calculate_cost(self, input_tokens, output_tokens, model="gpt-4o"):
-        """Calculate cost"""
-        if model not in self.pricing:
-            model = "gpt-4o"
-        input_cost = input_tokens * self.pricing[model]['input']
-        output_cost = output_tokens * self.pricing[model]['output']
-        return input_cost + output_cost
+# Submitted batch id, topics and sampled links, kept until its results are collected so a run can resume it
+BATCH_STATE_FILE = os.path.join('.cache', 'openai_batch.json')
 
-    def create_blog_prompt(self, topic_data, seo_keywords, llm_keywords, website_links):
-        """Builds the structured blog prompt"""
-        topic = topic_data.get('Topic', 'AI Technology')
-        description = topic_data.get('Description', '')
-        source = topic_data.get('Source & URL', '')
+# Batch API reads that hit these statuses or a connection error are retried; they are idempotent
+BATCH_RETRY_STATUSES = {429, 500, 502, 503, 504}
 
-        seo_kw_list = seo_keywords.iloc[:, 0].tolist()[:5]
-        llm_kw_list = llm_keywords.iloc[:, 0].tolist()[:5]
-
-        random_links = website_links.sample(min(3, len(website_links)))
-        links_text = "\n".join(
-            [f"- {link.get('Name', 'Link')}: {link.get('URL', '')}" for _, link in random_links.iterrows()]
-        )
-
-        prompt = f"""
+# Blog prompt; only the topic, keyword and link fields change between blogs
+PROMPT_TEMPLATE = """
 Write a comprehensive, SEO-optimized blog post about "{topic}".
 
 TOPIC DETAILS:
@@ -81,8 +50,8 @@ TOPIC DETAILS:
 IMPORTANT: Never hallucinate statistics or numbers. Only use verified information.
 
 SEO REQUIREMENTS:
-- Target these SEO keywords naturally: {', '.join(seo_kw_list)}
-- Include these LLM-optimized phrases: {', '.join(llm_kw_list)}
+- Target these SEO keywords naturally: {seo_text}
+- Include these LLM-optimized phrases: {llm_text}
 - Target 90+ SEMrush SEO score
 - 1500-2000 words
 - Keyword density: 1-2%
@@ -159,97 +128,498 @@ A: [Answer]
 
 Generate the complete blog post following this structure exactly.
 """
-        return prompt
+
+# Seconds a connection test result is reused before probing OpenAI again
+CONNECTION_CACHE_TTL = 60
+
+# Transient OpenAI errors are retried with jittered exponential backoff, capped at RETRY_MAX_WAIT seconds
+MAX_RETRIES = 5
+RETRY_MAX_WAIT = 30
+RETRYABLE_ERRORS = (
+    openai.error.RateLimitError,
+    openai.error.APIError,
+    openai.error.Timeout,
+    openai.error.APIConnectionError,
+    openai.error.ServiceUnavailableError,
+    openai.error.TryAgain,
+)
+
+
+class BlogGenerator:
+    def __init__(self, http_session=None, estimate_tokens=False):
+        """Initialize the blog generator with OpenAI API, optionally on a shared requests.Session.
+        Set estimate_tokens to print a tiktoken estimate of each prompt before it is sent."""
+        openai.api_key = os.getenv('OPENAI_API_KEY')
+        self.estimate_tokens = estimate_tokens
+        if http_session is not None:
+            # The openai SDK sends its synchronous calls through this session
+            openai.requestssession = http_session
+        # Batch API calls go through the same keep-alive pool instead of opening a connection per request
+        self._http = http_session or requests.Session()
+
+        # Token tracking variables
+        self.total_input_tokens = 0
+        self.total_output_tokens = 0
+        self.total_cost = 0.0
+        self._totals_lock = threading.Lock()  # generate_blog may run on several threads
+
+        # Cached connection test result as (value, expires_at)
+        self._connection_cache = (None, 0.0)
+
+        # tiktoken encoders by model, built on first use
+        self._encoders = {}
+
+        # GPT pricing (as of 2024)
+        self.pricing = {
+            'gpt-4o': {
+                'input': 0.005 / 1000,
+                'output': 0.015 / 1000
+            },
+            'gpt-3.5-turbo': {
+                'input': 0.0005 / 1000,
+                'output': 0.0015 / 1000
+            }
+        }
+
+    def count_tokens(self, text, model="gpt-4o"):
+        """Count tokens in text"""
+        if HAS_TIKTOKEN:
+            try:
+                encoding = self._encoders.get(model)
+                if encoding is None:
+                    encoding = self._encoders[model] = tiktoken.encoding_for_model(model)
+                return len(encoding.encode(text))
+            except:
+                pass
+        return len(text) // 4
+
+    def calculate_cost(self, input_tokens, output_tokens, model="gpt-4o"):
+        """Calculate cost"""
+        if model not in self.pricing:
+            model = "gpt-4o"
+        input_cost = input_tokens * self.pricing[model]['input']
+        output_cost = output_tokens * self.pricing[model]['output']
+        return input_cost + output_cost
+
+    def build_prompt_context(self, seo_keywords, llm_keywords, website_links):
+        """Precompute the keyword lists and prompt fragments shared by every blog in a run"""
+        seo_kw_list = seo_keywords.iloc[:5, 0].tolist()
+        llm_kw_list = llm_keywords.iloc[:5, 0].tolist()
+        return {
+            'seo_keywords': seo_kw_list,
+            'llm_keywords': llm_kw_list,
+            'seo_text': ', '.join(seo_kw_list),
+            'llm_text': ', '.join(llm_kw_list),
+            # Plain dicts so each prompt samples links without building DataFrames
+            'link_records': website_links.to_dict('records')
+        }
+
+    def create_blog_prompt(self, topic_data, seo_keywords, llm_keywords, website_links):
+        """Builds the structured blog prompt"""
+        prompt_ctx = self.build_prompt_context(seo_keywords, llm_keywords, website_links)
+        return self.create_blog_prompt_precomputed(topic_data, prompt_ctx)
+
+    def _sample_links(self, prompt_ctx):
+        """Pick the internal links for one blog"""
+        link_records = prompt_ctx['link_records']
+        return random.sample(link_records, min(3, len(link_records)))
+
+    def create_blog_prompt_precomputed(self, topic_data, prompt_ctx, links=None):
+        """Builds the structured blog prompt from a prepared prompt context"""
+        topic = topic_data.get('Topic', 'AI Technology')
+        description = topic_data.get('Description', '')
+        source = topic_data.get('Source & URL', '')
+
+        if links is None:
+            links = self._sample_links(prompt_ctx)
+        links_text = "\n".join(
+            [f"- {link.get('Name', 'Link')}: {link.get('URL', '')}" for link in links]
+        )
+
+        return PROMPT_TEMPLATE.format(
+            topic=topic,
+            description=description,
+            source=source,
+            seo_text=prompt_ctx['seo_text'],
+            llm_text=prompt_ctx['llm_text'],
+            links_text=links_text
+        )
+
+    def _prepare_messages(self, topic_data, prompt_ctx):
+        """Build the chat messages for a blog request, returning them with the links the prompt uses"""
+        links = self._sample_links(prompt_ctx)
+        prompt = self.create_blog_prompt_precomputed(topic_data, prompt_ctx, links)
+        system_message = "You are an expert SEO blog writer specializing in AI and technology content."
+
+        # The API reports exact usage, so the tokenizer pass is only worth it when asked for
+        if self.estimate_tokens:
+            estimated_input_tokens = self.count_tokens(system_message + prompt)
+            print(f"📊 Estimated input tokens: {estimated_input_tokens:,}")
+
+        messages = [
+            {"role": "system", "content": system_message},
+            {"role": "user", "content": prompt}
+        ]
+        return messages, links
+
+    def _completion_kwargs(self, model, messages):
+        """Arguments for a chat completion request with the given model"""
+        return {
+            'model': model,
+            'messages': messages,
+            'max_tokens': 3000 if model == "gpt-3.5-turbo" else 4000,
+            'temperature': 0.7
+        }
+
+    def _retry_delay(self, error, attempt):
+        """Seconds to wait before retrying a failed request, or None if it should not be retried"""
+        if not isinstance(error, RETRYABLE_ERRORS) or attempt >= MAX_RETRIES:
+            return None
+        # An exhausted quota is reported as a 429 but will not recover by waiting
+        error_body = (getattr(error, 'json_body', None) or {}).get('error') or {}
+        if error_body.get('code') == 'insufficient_quota':
+            return None
+
+        retry_after = (getattr(error, 'headers', None) or {}).get('retry-after')
+        try:
+            return min(float(retry_after), RETRY_MAX_WAIT)
+        except (TypeError, ValueError):
+            return random.uniform(0, min(RETRY_MAX_WAIT, 2 ** attempt))
+
+    def _create_with_retry(self, **kwargs):
+        """Create a chat completion, retrying rate limits and transient server errors"""
+        attempt = 0
+        while True:
+            try:
+                return openai.ChatCompletion.create(**kwargs)
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                attempt += 1
+                print(f"⏳ {type(e).__name__}, retrying in {delay:.1f}s ({attempt}/{MAX_RETRIES})")
+                time.sleep(delay)
+
+    async def _acreate_with_retry(self, **kwargs):
+        """Async _create_with_retry"""
+        attempt = 0
+        while True:
+            try:
+                return await openai.ChatCompletion.acreate(**kwargs)
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                attempt += 1
+                print(f"⏳ {type(e).__name__}, retrying in {delay:.1f}s ({attempt}/{MAX_RETRIES})")
+                await asyncio.sleep(delay)
+
+    def _model_failed(self, model, model_error):
+        """Report a failed model attempt"""
+        if isinstance(model_error, (openai.error.AuthenticationError, openai.error.PermissionError)):
+            self.invalidate_connection_cache()
+        print(f"❌ Model {model} failed: {str(model_error)}")
+
+    def _build_result(self, topic_name, response, model, prompt_ctx, links, price_factor=1.0):
+        """Track usage for a completion and build the blog result"""
+        blog_content = response["choices"][0]["message"]["content"]
+
+        usage = response["usage"]
+        actual_input_tokens = usage["prompt_tokens"]
+        actual_output_tokens = usage["completion_tokens"]
+        total_tokens = usage["total_tokens"]
+
+        cost = self.calculate_cost(actual_input_tokens, actual_output_tokens, model) * price_factor
+
+        with self._totals_lock:
+            self.total_input_tokens += actual_input_tokens
+            self.total_output_tokens += actual_output_tokens
+            self.total_cost += cost
+            running_total_cost = self.total_cost
+
+        print(f"✅ Blog generated successfully!")
+        print(f"📊 Input tokens: {actual_input_tokens:,}")
+        print(f"📊 Output tokens: {actual_output_tokens:,}")
+        print(f"📊 Total tokens: {total_tokens:,}")
+        print(f"💰 Cost for this blog: ${cost:.4f}")
+        print(f"💰 Running total cost: ${running_total_cost:.4f}")
+
+        return {
+            'topic': topic_name,
+            'content': blog_content,
+            'seo_keywords_used': prompt_ctx['seo_keywords'],
+            'llm_keywords_used': prompt_ctx['llm_keywords'],
+            'links_used': [link.get('Name', 'Link') for link in links],
+            'word_count': len(blog_content.split()),
+            'model_used': model,
+            'input_tokens': actual_input_tokens,
+            'output_tokens': actual_output_tokens,
+            'total_tokens': total_tokens,
+            'cost': cost,
+            'status': 'success'
+        }
+
+    def _failed_result(self, topic_data, error):
+        """Build the result for a blog that could not be generated"""
+        print(f"❌ Error generating blog: {str(error)}")
+        return {
+            'topic': topic_data.get('Topic', 'Unknown'),
+            'content': '',
+            'error': str(error),
+            'model_used': 'unknown',
+            'input_tokens': 0,
+            'output_tokens': 0,
+            'total_tokens': 0,
+            'cost': 0.0,
+            'status': 'failed'
+        }
 
     def generate_blog(self, topic_data, seo_keywords, llm_keywords, website_links):
         """Generate a blog post with token tracking"""
+        prompt_ctx = self.build_prompt_context(seo_keywords, llm_keywords, website_links)
+        return self.generate_blog_precomputed(topic_data, prompt_ctx)
+
+    def generate_blog_precomputed(self, topic_data, prompt_ctx):
+        """Generate a blog post with token tracking from a prepared prompt context"""
         try:
             topic_name = topic_data.get('Topic', 'Unknown')
             print(f"🤖 Generating blog for topic: {topic_name}")
 
-            prompt = self.create_blog_prompt(topic_data, seo_keywords, llm_keywords, website_links)
-            system_message = "You are an expert SEO blog writer specializing in AI and technology content."
-
-            estimated_input_tokens = self.count_tokens(system_message + prompt)
-            print(f"📊 Estimated input tokens: {estimated_input_tokens:,}")
-
-            models_to_try = ["gpt-4o", "gpt-3.5-turbo"]
+            messages, links = self._prepare_messages(topic_data, prompt_ctx)
 
             response = None
             model = None
-            for m in models_to_try:
+            for m in MODELS_TO_TRY:
                 try:
                     print(f"🔄 Trying model: {m}")
-                    response = openai.ChatCompletion.create(
-                        model=m,
-                        messages=[
-                            {"role": "system", "content": system_message},
-                            {"role": "user", "content": prompt}
-                        ],
-                        max_tokens=3000 if m == "gpt-3.5-turbo" else 4000,
-                        temperature=0.7
-                    )
+                    response = self._create_with_retry(**self._completion_kwargs(m, messages))
                     model = m
                     print(f"✅ Successfully used model: {m}")
                     break
                 except Exception as model_error:
-                    print(f"❌ Model {m} failed: {str(model_error)}")
+                    self._model_failed(m, model_error)
                     continue
 
             if not response:
                 raise RuntimeError("All models failed")
 
-            blog_content = response["choices"][0]["message"]["content"]
+            return self._build_result(topic_name, response, model, prompt_ctx, links)
 
-            usage = response["usage"]
-            actual_input_tokens = usage["prompt_tokens"]
-            actual_output_tokens = usage["completion_tokens"]
-            total_tokens = usage["total_tokens"]
+        except Exception as e:
+            return self._failed_result(topic_data, e)
+
+    @contextlib.asynccontextmanager
+    async def async_session(self):
+        """Share one aiohttp session across the agenerate_* calls made inside this context"""
+        # Without a session set, the openai SDK opens a new connection for every acreate call
+        async with aiohttp.ClientSession() as session:
+            token = openai.aiosession.set(session)
+            try:
+                yield session
+            finally:
+                openai.aiosession.reset(token)
 
-            cost = self.calculate_cost(actual_input_tokens, actual_output_tokens, model)
+    async def agenerate_blog(self, topic_data, seo_keywords, llm_keywords, website_links):
+        """Generate a blog post with token tracking, without blocking the event loop on the API call"""
+        prompt_ctx = self.build_prompt_context(seo_keywords, llm_keywords, website_links)
+        return await self.agenerate_blog_precomputed(topic_data, prompt_ctx)
 
-            self.total_input_tokens += actual_input_tokens
-            self.total_output_tokens += actual_output_tokens
-            self.total_cost += cost
+    async def agenerate_blog_precomputed(self, topic_data, prompt_ctx):
+        """Async generate_blog_precomputed"""
+        try:
+            topic_name = topic_data.get('Topic', 'Unknown')
+            print(f"🤖 Generating blog for topic: {topic_name}")
 
-            print(f"✅ Blog generated successfully!")
-            print(f"📊 Input tokens: {actual_input_tokens:,}")
-            print(f"📊 Output tokens: {actual_output_tokens:,}")
-            print(f"📊 Total tokens: {total_tokens:,}")
-            print(f"💰 Cost for this blog: ${cost:.4f}")
-            print(f"💰 Running total cost: ${self.total_cost:.4f}")
-
-            return {
-                'topic': topic_name,
-                'content': blog_content,
-                'seo_keywords_used': seo_keywords.iloc[:, 0].tolist()[:5],
-                'llm_keywords_used': llm_keywords.iloc[:, 0].tolist()[:5],
-                'links_used': website_links.sample(min(3, len(website_links)))['Name'].tolist(),
-                'word_count': len(blog_content.split()),
-                'model_used': model,
-                'input_tokens': actual_input_tokens,
-                'output_tokens': actual_output_tokens,
-                'total_tokens': total_tokens,
-                'cost': cost,
-                'status': 'success'
-            }
+            messages, links = self._prepare_messages(topic_data, prompt_ctx)
+
+            response = None
+            model = None
+            for m in MODELS_TO_TRY:
+                try:
+                    print(f"🔄 Trying model: {m}")
+                    response = await self._acreate_with_retry(**self._completion_kwargs(m, messages))
+                    model = m
+                    print(f"✅ Successfully used model: {m}")
+                    break
+                except Exception as model_error:
+                    self._model_failed(m, model_error)
+                    continue
+
+            if not response:
+                raise RuntimeError("All models failed")
+
+            return self._build_result(topic_name, response, model, prompt_ctx, links)
 
         except Exception as e:
-            print(f"❌ Error generating blog: {str(e)}")
-            return {
-                'topic': topic_data.get('Topic', 'Unknown'),
-                'content': '',
-                'error': str(e),
-                'model_used': 'unknown',
-                'input_tokens': 0,
-                'output_tokens': 0,
-                'total_tokens': 0,
-                'cost': 0.0,
-                'status': 'failed'
-            }
+            return self._failed_result(topic_data, e)
+
+    def _batch_request(self, method, path, **kwargs):
+        """Call an OpenAI REST endpoint used by the Batch API, retrying transient failures of GET requests"""
+        # POSTs are not retried: a repeated batch creation would be billed twice
+        retries = MAX_RETRIES if method == 'GET' else 0
+        for attempt in range(retries + 1):
+            try:
+                response = self._http.request(
+                    method,
+                    f"{OPENAI_API_BASE}{path}",
+                    headers={'Authorization': f'Bearer {openai.api_key}'},
+                    timeout=60,
+                    **kwargs
+                )
+                if response.status_code not in BATCH_RETRY_STATUSES or attempt >= retries:
+                    response.raise_for_status()
+                    return response
+                error = f"HTTP {response.status_code}"
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= retries:
+                    raise
+                error = type(e).__name__
+            delay = random.uniform(0, min(RETRY_MAX_WAIT, 2 ** attempt))
+            print(f"⏳ Batch API {error}, retrying in {delay:.1f}s ({attempt + 1}/{retries})")
+            time.sleep(delay)
+
+    def _load_batch_state(self):
+        """Return the saved state of a batch whose results were not collected yet, or None"""
+        try:
+            with open(BATCH_STATE_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save_batch_state(self, state):
+        """Remember a submitted batch until its results are collected"""
+        os.makedirs(os.path.dirname(BATCH_STATE_FILE), exist_ok=True)
+        tmp_file = f"{BATCH_STATE_FILE}.{os.getpid()}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_file, BATCH_STATE_FILE)
+
+    def _submit_batch(self, topics, prompt_ctx):
+        """Upload the batch input file and create the batch, returning (batch_id, links per topic)"""
+        lines = []
+        topic_links = []
+        for i, topic_data in enumerate(topics):
+            messages, links = self._prepare_messages(topic_data, prompt_ctx)
+            topic_links.append(links)
+            lines.append(json.dumps({
+                'custom_id': f"blog_{i}",
+                'method': 'POST',
+                'url': '/v1/chat/completions',
+                'body': self._completion_kwargs(BATCH_MODEL, messages)
+            }))
+
+        upload = self._batch_request(
+            'POST', '/files',
+            data={'purpose': 'batch'},
+            files={'file': ('batch_input.jsonl', '\n'.join(lines).encode('utf-8'))}
+        ).json()
+        batch = self._batch_request('POST', '/batches', json={
+            'input_file_id': upload['id'],
+            'endpoint': '/v1/chat/completions',
+            'completion_window': '24h'
+        }).json()
+        print(f"📦 Submitted batch {batch['id']} with {len(lines)} blogs")
+        return batch['id'], topic_links
+
+    def _batch_file_items(self, file_id):
+        """Download a batch output or error file as {custom_id: item}"""
+        items = {}
+        if file_id:
+            content = self._batch_request('GET', f"/files/{file_id}/content").text
+            for line in content.splitlines():
+                if line.strip():
+                    item = json.loads(line)
+                    items[item['custom_id']] = item
+        return items
+
+    def _batch_item_error(self, item):
+        """Readable error for a batch request that did not return a completion"""
+        response = item.get('response') or {}
+        error = (response.get('body') or {}).get('error') or item.get('error')
+        if isinstance(error, dict):
+            return error.get('message') or error.get('code') or str(error)
+        return error or f"Batch request failed with HTTP {response.get('status_code')}"
+
+    def generate_blogs_batch(self, topics, seo_keywords, llm_keywords, website_links,
+                             poll_interval=BATCH_POLL_INTERVAL):
+        """Generate blogs through the OpenAI Batch API at half the token price, waiting for completion"""
+        return list(self.iter_blogs_batch(topics, seo_keywords, llm_keywords, website_links, poll_interval))
+
+    def iter_blogs_batch(self, topics, seo_keywords, llm_keywords, website_links,
+                         poll_interval=BATCH_POLL_INTERVAL):
+        """generate_blogs_batch, yielding each topic's result in order so callers can record it and let it go"""
+        prompt_ctx = self.build_prompt_context(seo_keywords, llm_keywords, website_links)
+        topic_names = [topic_data.get('Topic', 'Unknown') for topic_data in topics]
+
+        # Resume a batch an earlier run submitted for the same topics instead of paying for a new one
+        state = self._load_batch_state()
+        if state and state.get('topics') == topic_names:
+            batch_id, topic_links = state['batch_id'], state['links']
+            print(f"🔁 Resuming batch {batch_id}")
+        else:
+            if state:
+                print(f"⚠️ Saved batch {state.get('batch_id')} was for different topics; submitting a new batch")
+            try:
+                batch_id, topic_links = self._submit_batch(topics, prompt_ctx)
+            except Exception as e:
+                for topic_data in topics:
+                    yield self._failed_result(topic_data, e)
+                return
+            self._save_batch_state({'batch_id': batch_id, 'topics': topic_names, 'links': topic_links})
+
+        try:
+            batch = self._batch_request('GET', f"/batches/{batch_id}").json()
+            while batch['status'] not in BATCH_TERMINAL_STATUSES:
+                time.sleep(poll_interval)
+                batch = self._batch_request('GET', f"/batches/{batch_id}").json()
+                counts = batch.get('request_counts', {})
+                print(f"⏳ Batch {batch['status']}: {counts.get('completed', 0)}/{counts.get('total', len(topics))} done")
+
+            # Expired and cancelled batches still return the requests that finished; failed ones go to the error file
+            responses = self._batch_file_items(batch.get('error_file_id'))
+            responses.update(self._batch_file_items(batch.get('output_file_id')))
+        except Exception as e:
+            # The batch keeps running server-side; its id stays in BATCH_STATE_FILE for the next run
+            error = f"Batch {batch_id} results not collected ({str(e)}); re-run to resume it"
+            for topic_data in topics:
+                yield self._failed_result(topic_data, error)
+            return
+
+        os.remove(BATCH_STATE_FILE)
+        if batch['status'] != 'completed':
+            print(f"⚠️ Batch {batch_id} ended with status '{batch['status']}'")
+
+        for i, topic_data in enumerate(topics):
+            # Pop each raw item as it is consumed so downloaded output shrinks as results are handed out
+            item = responses.pop(f"blog_{i}", None)
+            if item is None:
+                yield self._failed_result(topic_data, f"No response returned by batch (status '{batch['status']}')")
+                continue
+            response = item.get('response') or {}
+            if response.get('status_code') != 200:
+                yield self._failed_result(topic_data, self._batch_item_error(item))
+                continue
+            yield self._build_result(
+                topic_data.get('Topic', 'Unknown'), response['body'], BATCH_MODEL,
+                prompt_ctx, topic_links[i], price_factor=BATCH_PRICE_FACTOR
+            )
+
+    def invalidate_connection_cache(self):
+        """Forget the cached connection test result"""
+        self._connection_cache = (None, 0.0)
 
     def test_connection(self):
-        """Test OpenAI API connection"""
+        """Test OpenAI API connection, reusing a recent result for CONNECTION_CACHE_TTL seconds"""
+        value, expires_at = self._connection_cache
+        if value is not None and time.monotonic() < expires_at:
+            return value
+
+        value = self._probe_connection()
+        self._connection_cache = (value, time.monotonic() + CONNECTION_CACHE_TTL)
+        return value
+
+    def _probe_connection(self):
+        """Probe the OpenAI API with a live request"""
         try:
             response = openai.ChatCompletion.create(
                 model="gpt-3.5-turbo",
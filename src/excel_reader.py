@@ -1,5 +1,7 @@
 import pandas as pd
 import os
+import pickle
+import hashlib
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -7,19 +9,51 @@ load_dotenv()
 
 
 class ExcelReader:
-    def __init__(self, excel_file_path):
+    def __init__(self, excel_file_path, cache_dir=None, verbose=False):
         """
-        Initialize the Excel reader with the path to your Excel file
+        Initialize the Excel reader with the path to your Excel file.
+        When cache_dir is set, parsed sheets are pickled there and reused until the file changes.
+        Set verbose to print progress and a preview of each sheet; errors are always printed.
         """
         self.excel_file_path = excel_file_path
+        self.cache_dir = cache_dir
+        self.verbose = verbose
         self.data = {}
 
+    def _cache_file(self):
+        """Pickle path keyed on the Excel file's path, mtime and size, or None if caching is off"""
+        if not self.cache_dir or not os.path.exists(self.excel_file_path):
+            return None
+        stat = os.stat(self.excel_file_path)
+        key = (os.path.abspath(self.excel_file_path), stat.st_mtime, stat.st_size)
+        return os.path.join(self.cache_dir, f"keyinsights_{hashlib.sha1(repr(key).encode()).hexdigest()[:16]}.pkl")
+
     def read_all_sheets(self):
         """
         Read the first 4 sheets from Excel file as mentioned in your project
         """
+        cache_file = self._cache_file()
+        if cache_file and os.path.exists(cache_file):
+            print(f"⚡ Using cached Excel data: {cache_file}")
+            with open(cache_file, 'rb') as f:
+                self.data = pickle.load(f)
+            return self.data
+
+        data = self._parse_sheets()
+        if data and cache_file:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write then rename so concurrent readers never see a partial pickle
+            tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+            with open(tmp_file, 'wb') as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, cache_file)
+        return data
+
+    def _parse_sheets(self):
+        """Parse the expected sheets from the Excel file"""
         try:
-            print(f"Reading Excel file: {self.excel_file_path}")
+            if self.verbose:
+                print(f"Reading Excel file: {self.excel_file_path}")
 
             # Define the expected sheet names
             expected_sheets = [
@@ -29,24 +63,27 @@ class ExcelReader:
                 'key topics'
             ]
 
-            # Read all sheets
-            excel_data = pd.read_excel(self.excel_file_path, sheet_name=None)
+            # Open the workbook once (openpyxl read-only mode) and parse only the sheets we use
+            with pd.ExcelFile(self.excel_file_path, engine='openpyxl') as excel_file:
+                if self.verbose:
+                    # Display available sheets
+                    print(f"Available sheets: {excel_file.sheet_names}")
 
-            # Display available sheets
-            print(f"Available sheets: {list(excel_data.keys())}")
+                # Try to read each expected sheet
+                for sheet_name in expected_sheets:
+                    if sheet_name in excel_file.sheet_names:
+                        sheet = excel_file.parse(sheet_name)
+                        self.data[sheet_name] = sheet
 
-            # Try to read each expected sheet
-            for sheet_name in expected_sheets:
-                if sheet_name in excel_data:
-                    self.data[sheet_name] = excel_data[sheet_name]
-                    print(f"✅ Successfully read '{sheet_name}' - {len(excel_data[sheet_name])} rows")
+                        if self.verbose:
+                            print(f"✅ Successfully read '{sheet_name}' - {len(sheet)} rows")
 
-                    # Display first few rows to see the structure
-                    print(f"Preview of '{sheet_name}':")
-                    print(excel_data[sheet_name].head())
-                    print("-" * 50)
-                else:
-                    print(f"❌ Sheet '{sheet_name}' not found")
+                            # Display first few rows to see the structure
+                            print(f"Preview of '{sheet_name}':")
+                            print(sheet.head())
+                            print("-" * 50)
+                    else:
+                        print(f"❌ Sheet '{sheet_name}' not found")
 
             return self.data
 
@@ -99,7 +136,7 @@ if __name__ == "__main__":
         exit()
 
     # Create reader instance
-    reader = ExcelReader(excel_file)
+    reader = ExcelReader(excel_file, verbose=True)
 
     # Read all sheets
     data = reader.read_all_sheets()
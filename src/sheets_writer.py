@@ -1,28 +1,101 @@
 import os
+import re
+import sys
 import json
-from datetime import datetime
+import time
+import random
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from dotenv import load_dotenv
-import pandas as pd
 
 # Load environment variables
 load_dotenv()
 
+# Try to import orjson for faster JSON parsing, fallback to stdlib json if not available
 try:
-    from google.oauth2.credentials import Credentials
-    from google_auth_oauthlib.flow import Flow
-    from google.auth.transport.requests import Request
-    from googleapiclient.discovery import build
-    from google.oauth2.service_account import Credentials as ServiceCredentials
+    import orjson
+    HAS_ORJSON = True
 except ImportError:
-    print("❌ Google API libraries not installed. Install with:")
-    print("pip install google-api-python-client google-auth-httplib2 google-auth-oauthlib")
-    exit()
+    HAS_ORJSON = False
+
+# The Google client libraries, pandas and aiohttp are imported where they are used: they pull in
+# hundreds of modules, and importing this module should stay cheap when no SheetsWriter is ever built
+
+# OAuth scope requested for both service account and user credentials
+SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
+
+# Credentials and built Sheets services, keyed by credentials file, shared by every SheetsWriter
+_CREDENTIALS_CACHE = {}
+_SERVICE_CACHE = {}
+
+# Tokens this close to expiry are refreshed in the background before the next write needs them
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+_REFRESH_LOCK = threading.Lock()
+
+# Authorized httplib2 clients per thread, keyed by credentials file; httplib2.Http is not thread-safe
+_THREAD_HTTP = threading.local()
+
+# Meta lines emitted at the top of generated blogs
+_META_RE = re.compile(r'^META_(TITLE|DESCRIPTION):[ \t]*(.*)$', re.M)
+
+# Blog result keys joined into comma-separated cells
+_LIST_COLUMNS = ['seo_keywords_used', 'llm_keywords_used', 'links_used']
+
+# Sheets values API endpoint used by the async write path
+SHEETS_API_URL = 'https://sheets.googleapis.com/v4/spreadsheets'
+
+# Rate-limited and unavailable responses are retried with jittered exponential backoff, capped at RETRY_MAX_WAIT seconds
+MAX_RETRIES = 5
+RETRY_MAX_WAIT = 64
+RETRYABLE_STATUSES = {429, 500, 503}
+# Writes are retried on 429 only: it means nothing was written, while a 5xx can follow a committed append
+WRITE_RETRYABLE_STATUSES = {429}
+
+# Sheets allows 60 writes per minute per user; writes share a token bucket refilled at this rate, with a small burst
+WRITES_PER_SECOND = 1.0
+WRITE_BURST = 5
+MAX_CONCURRENT_WRITES = 5
+_WRITE_LOCK = threading.Lock()
+_WRITE_BUCKET = {'tokens': WRITE_BURST, 'updated': time.monotonic()}
+
+
+def _reserve_write():
+    """Take a token from the shared write bucket and return how long to wait before using it"""
+    with _WRITE_LOCK:
+        now = time.monotonic()
+        tokens = min(WRITE_BURST, _WRITE_BUCKET['tokens'] + (now - _WRITE_BUCKET['updated']) * WRITES_PER_SECOND)
+        _WRITE_BUCKET['tokens'] = tokens - 1
+        _WRITE_BUCKET['updated'] = now
+    return max(0.0, (1 - tokens) / WRITES_PER_SECOND)
+
+
+def _retry_delay(status, retry_after, attempt, write=False):
+    """Seconds to wait before retrying a failed request, or None if it should not be retried"""
+    retryable = WRITE_RETRYABLE_STATUSES if write else RETRYABLE_STATUSES
+    if status not in retryable or attempt >= MAX_RETRIES:
+        return None
+    try:
+        return min(float(retry_after), RETRY_MAX_WAIT)
+    except (TypeError, ValueError):
+        return random.uniform(0, min(RETRY_MAX_WAIT, 2 ** attempt))
+
+
+def _save_token(token_file, credentials):
+    """Write the OAuth token file, then rename it into place so a crash never leaves a partial token"""
+    tmp_file = f"{token_file}.{os.getpid()}.tmp"
+    with open(tmp_file, 'w') as f:
+        f.write(credentials.to_json())
+    os.replace(tmp_file, token_file)
 
 
 class SheetsWriter:
     def __init__(self):
         """Initialize Google Sheets connection"""
         self.service = None
+        self._credentials = None
+        self._tab_id = None  # sheetId of the first tab, looked up on first use
         self.sheet_id = os.getenv('GOOGLE_SHEET_ID')
         self.credentials_file = os.getenv('GOOGLE_CREDENTIALS_FILE', '../credentials.json')
 
@@ -33,7 +106,19 @@ class SheetsWriter:
         self.setup_sheets_connection()
 
     def setup_sheets_connection(self):
-        """Setup Google Sheets API connection"""
+        """Setup Google Sheets API connection, reusing credentials and service built by earlier instances"""
+        if self.credentials_file in _SERVICE_CACHE:
+            self._credentials = _CREDENTIALS_CACHE[self.credentials_file]
+            self.service = _SERVICE_CACHE[self.credentials_file]
+            return
+
+        try:
+            from googleapiclient.discovery import build
+        except ImportError:
+            print("❌ Google API libraries not installed. Install with:")
+            print("pip install google-api-python-client google-auth-httplib2 google-auth-oauthlib")
+            return
+
         try:
             # Check if credentials file exists
             if not os.path.exists(self.credentials_file):
@@ -41,48 +126,118 @@ class SheetsWriter:
                 print("Please make sure your Google credentials JSON file is in the project folder")
                 return
 
-            # Try service account first (recommended for automation)
-            try:
-                credentials = ServiceCredentials.from_service_account_file(
-                    self.credentials_file,
-                    scopes=['https://www.googleapis.com/auth/spreadsheets']
-                )
-                print("✅ Using Service Account authentication")
-            except Exception:
-                # Fall back to OAuth flow
-                print("🔄 Using OAuth authentication (will open browser)")
-                flow = Flow.from_client_secrets_file(
-                    self.credentials_file,
-                    scopes=['https://www.googleapis.com/auth/spreadsheets'],
-                    redirect_uri='http://localhost:8080/callback'
-                )
-
-                # Check for existing token
-                token_file = 'token.json'
-                if os.path.exists(token_file):
-                    credentials = Credentials.from_authorized_user_file(token_file)
-                    if credentials.expired and credentials.refresh_token:
-                        credentials.refresh(Request())
-                else:
-                    # Run OAuth flow
-                    auth_url, _ = flow.authorization_url(prompt='consent')
-                    print(f"Please visit: {auth_url}")
-                    code = input("Enter authorization code: ")
-                    flow.fetch_token(code=code)
-                    credentials = flow.credentials
-
-                    # Save token for future use
-                    with open(token_file, 'w') as f:
-                        f.write(credentials.to_json())
-
-            # Build the service
-            self.service = build('sheets', 'v4', credentials=credentials)
+            credentials = _CREDENTIALS_CACHE.get(self.credentials_file) or self._load_credentials()
+            _CREDENTIALS_CACHE[self.credentials_file] = credentials
+
+            # Build the service from the discovery document bundled with the client library; no HTTPS
+            # discovery fetch happens, so there is nothing for a discovery cache to save
+            self.service = build('sheets', 'v4', credentials=credentials, cache_discovery=False, static_discovery=True)
+            self._credentials = credentials
+            _SERVICE_CACHE[self.credentials_file] = self.service
             print("✅ Google Sheets API connection successful!")
 
         except Exception as e:
             print(f"❌ Failed to connect to Google Sheets: {str(e)}")
             self.service = None
 
+    def _load_credentials(self):
+        """Load service account or OAuth credentials, chosen by the credentials file's type"""
+        from google.oauth2.credentials import Credentials
+        from google.oauth2.service_account import Credentials as ServiceCredentials
+        from google.auth.transport.requests import Request
+        from google_auth_oauthlib.flow import Flow
+
+        # Parse the file once and hand the dict to google-auth instead of letting it re-read the file
+        with open(self.credentials_file, 'rb') as f:
+            raw = f.read()
+        credentials_info = orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+
+        # Service account keys are recommended for automation
+        if credentials_info.get('type') == 'service_account':
+            credentials = ServiceCredentials.from_service_account_info(credentials_info, scopes=SCOPES)
+            print("✅ Using Service Account authentication")
+            return credentials
+
+        # Anything else is an OAuth client secrets file
+        print("🔄 Using OAuth authentication (will open browser)")
+
+        # Check for existing token
+        token_file = 'token.json'
+        if os.path.exists(token_file):
+            credentials = Credentials.from_authorized_user_file(token_file)
+            if credentials.expired and credentials.refresh_token:
+                credentials.refresh(Request())
+                # Persist the refreshed token so the next run does not have to refresh it again
+                _save_token(token_file, credentials)
+        else:
+            # Run OAuth flow
+            flow = Flow.from_client_config(
+                credentials_info,
+                scopes=SCOPES,
+                redirect_uri='http://localhost:8080/callback'
+            )
+            auth_url, _ = flow.authorization_url(prompt='consent')
+            print(f"Please visit: {auth_url}")
+            code = input("Enter authorization code: ")
+            flow.fetch_token(code=code)
+            credentials = flow.credentials
+
+            # Save token for future use
+            _save_token(token_file, credentials)
+
+        return credentials
+
+    def _maybe_refresh_async(self):
+        """Start a background token refresh if the current token is close to expiring"""
+        credentials = self._credentials
+        if credentials is None or not credentials.token or credentials.expiry is None:
+            return
+        # google-auth stores expiry as a naive UTC datetime
+        if credentials.expiry - datetime.utcnow() > TOKEN_REFRESH_MARGIN:
+            return
+        if not _REFRESH_LOCK.acquire(blocking=False):
+            return  # a refresh is already in flight
+
+        from google.auth.transport.requests import Request
+
+        def refresh():
+            try:
+                credentials.refresh(Request())
+            except Exception as e:
+                print(f"⚠️ Background token refresh failed: {str(e)}")
+            finally:
+                _REFRESH_LOCK.release()
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def _thread_http(self):
+        """Return this thread's authorized HTTP client, so requests can run from worker threads"""
+        from googleapiclient.http import build_http
+        from google_auth_httplib2 import AuthorizedHttp
+
+        clients = _THREAD_HTTP.__dict__.setdefault('clients', {})
+        if self.credentials_file not in clients:
+            clients[self.credentials_file] = AuthorizedHttp(self._credentials, http=build_http())
+        return clients[self.credentials_file]
+
+    def _execute(self, request, write=False):
+        """Execute a Sheets API request, throttling writes and retrying rate limits and transient errors"""
+        from googleapiclient.errors import HttpError
+
+        attempt = 0
+        while True:
+            if write:
+                time.sleep(_reserve_write())
+            try:
+                return request.execute(http=self._thread_http())
+            except HttpError as e:
+                delay = _retry_delay(e.resp.status, e.resp.get('retry-after'), attempt, write)
+                if delay is None:
+                    raise
+                attempt += 1
+                print(f"⏳ Sheets API {e.resp.status}, retrying in {delay:.1f}s ({attempt}/{MAX_RETRIES})")
+                time.sleep(delay)
+
     def create_blog_sheet_headers(self):
         """Create headers for the blog data sheet"""
         return [
@@ -99,6 +254,16 @@ class SheetsWriter:
             'Notes'
         ]
 
+    def _first_tab_id(self):
+        """Return the sheetId of the spreadsheet's first tab, which unqualified A1 ranges refer to"""
+        if self._tab_id is None:
+            metadata = self._execute(self.service.spreadsheets().get(
+                spreadsheetId=self.sheet_id,
+                fields='sheets.properties.sheetId'
+            ))
+            self._tab_id = metadata['sheets'][0]['properties']['sheetId']
+        return self._tab_id
+
     def setup_sheet_headers(self):
         """Setup headers in the Google Sheet"""
         if not self.service:
@@ -107,20 +272,25 @@ class SheetsWriter:
 
         try:
             headers = self.create_blog_sheet_headers()
+            tab_id = self._first_tab_id()
 
-            # Clear existing content and add headers
-            self.service.spreadsheets().values().clear(
-                spreadsheetId=self.sheet_id,
-                range='A1:Z1000'
-            ).execute()
-
-            # Add headers
-            self.service.spreadsheets().values().update(
+            # Clear A1:Z1000 and write the header row in a single batchUpdate
+            self._execute(self.service.spreadsheets().batchUpdate(
                 spreadsheetId=self.sheet_id,
-                range='A1',
-                valueInputOption='RAW',
-                body={'values': [headers]}
-            ).execute()
+                body={'requests': [
+                    {'updateCells': {
+                        'range': {'sheetId': tab_id, 'startRowIndex': 0, 'endRowIndex': 1000,
+                                  'startColumnIndex': 0, 'endColumnIndex': 26},
+                        'fields': 'userEnteredValue'
+                    }},
+                    {'updateCells': {
+                        'rows': [{'values': [{'userEnteredValue': {'stringValue': h}} for h in headers]}],
+                        'start': {'sheetId': tab_id, 'rowIndex': 0, 'columnIndex': 0},
+                        'fields': 'userEnteredValue'
+                    }}
+                ]},
+                fields='spreadsheetId'
+            ), write=True)
 
             print("✅ Sheet headers created successfully!")
             return True
@@ -130,18 +300,141 @@ class SheetsWriter:
             return False
 
     def extract_meta_from_blog(self, blog_content):
-        """Extract meta title and description from blog content"""
-        lines = blog_content.split('\n')
-        meta_title = ""
-        meta_description = ""
+        """Extract meta title and description from blog content; the first META_TITLE and META_DESCRIPTION lines win"""
+        # META lines lead the post, so stop scanning as soon as both have been seen
+        meta = {}
+        for match in _META_RE.finditer(blog_content):
+            meta.setdefault(match.group(1), match.group(2))
+            if len(meta) == 2:
+                break
+        return meta.get('TITLE', '').strip(), meta.get('DESCRIPTION', '').strip()
+
+    def _build_row(self, blog_result, timestamp=None):
+        """Build the sheet row for a blog result, stamped with timestamp or the current time"""
+        # Extract meta information
+        meta_title, meta_description = self.extract_meta_from_blog(blog_result.get('content', ''))
+
+        return [
+            timestamp or datetime.now().strftime('%Y-%m-%d %H:%M:%S'),  # Timestamp
+            blog_result.get('topic', ''),  # Topic
+            meta_title,  # Meta Title
+            meta_description,  # Meta Description
+            blog_result.get('content', ''),  # Blog Content
+            blog_result.get('word_count', 0),  # Word Count
+            ', '.join(blog_result.get('seo_keywords_used', [])),  # SEO Keywords
+            ', '.join(blog_result.get('llm_keywords_used', [])),  # LLM Keywords
+            ', '.join(blog_result.get('links_used', [])),  # Links Used
+            blog_result.get('status', 'unknown'),  # Status
+            blog_result.get('error', '')  # Notes/Errors
+        ]
+
+    def _build_rows(self, blog_results):
+        """Build the sheet rows for many blog results column-wise with pandas"""
+        import pandas as pd
+
+        df = pd.DataFrame(blog_results).reindex(
+            columns=['topic', 'content', 'word_count', 'status', 'error'] + _LIST_COLUMNS
+        )
+        df['content'] = df['content'].fillna('')
+        meta = df['content'].map(self.extract_meta_from_blog)
+        for column in _LIST_COLUMNS:
+            df[column] = df[column].map(lambda value: ', '.join(value) if isinstance(value, list) else '')
+
+        # Every row in a batch shares one timestamp
+        columns = [
+            [datetime.now().strftime('%Y-%m-%d %H:%M:%S')] * len(df),  # Timestamp
+            df['topic'].fillna('').tolist(),  # Topic
+            [title for title, _ in meta],  # Meta Title
+            [description for _, description in meta],  # Meta Description
+            df['content'].tolist(),  # Blog Content
+            df['word_count'].fillna(0).astype(int).tolist(),  # Word Count
+            df['seo_keywords_used'].tolist(),  # SEO Keywords
+            df['llm_keywords_used'].tolist(),  # LLM Keywords
+            df['links_used'].tolist(),  # Links Used
+            df['status'].fillna('unknown').tolist(),  # Status
+            df['error'].fillna('').tolist()  # Notes/Errors
+        ]
+        # Series.tolist() yields Python scalars, which the JSON request body needs
+        return [list(row) for row in zip(*columns)]
+
+    def _append_rows(self, rows):
+        """Append rows after the header row in one API call"""
+        # INSERT_ROWS append always lands below the current data, so it never overwrites rows written by others
+        self._execute(self.service.spreadsheets().values().append(
+            spreadsheetId=self.sheet_id,
+            range='A2',  # Start from row 2 (after headers)
+            valueInputOption='RAW',
+            insertDataOption='INSERT_ROWS',
+            body={'values': rows},
+            fields='updates/updatedRange'  # Partial response; the rest of UpdateValuesResponse is unused
+        ), write=True)
+
+    def _bearer_token(self):
+        """Return a valid access token, refreshing the credentials first if needed"""
+        from google.auth.transport.requests import Request
+
+        if not self._credentials.valid:
+            self._credentials.refresh(Request())
+        return self._credentials.token
+
+    def _report_saved(self, saved, total):
+        """Print the per-blog confirmations and the batch summary in a single write"""
+        lines = [f"✅ Blog '{blog_result.get('topic', 'Unknown')}' saved to Google Sheets!" for blog_result in saved]
+        lines.append(f"✅ Successfully saved {len(saved)}/{total} blogs to Google Sheets!")
+        print("\n".join(lines))
+
+    async def write_blog_to_sheets_async(self, session, blog_result, token, announce=True, timestamp=None):
+        """Append a single blog result to Google Sheets over a shared aiohttp session"""
+        row = self._build_row(blog_result, timestamp)
+        attempt = 0
+        try:
+            while True:
+                await asyncio.sleep(_reserve_write())
+                async with session.post(
+                    f"{SHEETS_API_URL}/{self.sheet_id}/values/A2:append",
+                    params={'valueInputOption': 'RAW', 'insertDataOption': 'INSERT_ROWS', 'fields': 'updates/updatedRange'},
+                    json={'values': [row]},
+                    headers={'Authorization': f'Bearer {token}'}
+                ) as response:
+                    if response.status == 200:
+                        break
+                    delay = _retry_delay(response.status, response.headers.get('Retry-After'), attempt, write=True)
+                    if delay is None:
+                        print(f"❌ Failed to write to Google Sheets: {response.status} - {await response.text()}")
+                        return False
+                attempt += 1
+                print(f"⏳ Sheets API {response.status}, retrying in {delay:.1f}s ({attempt}/{MAX_RETRIES})")
+                await asyncio.sleep(delay)
+
+            if announce:
+                print(f"✅ Blog '{blog_result.get('topic', 'Unknown')}' saved to Google Sheets!")
+            return True
 
-        for line in lines:
-            if line.startswith('META_TITLE:'):
-                meta_title = line.replace('META_TITLE:', '').strip()
-            elif line.startswith('META_DESCRIPTION:'):
-                meta_description = line.replace('META_DESCRIPTION:', '').strip()
+        except Exception as e:
+            print(f"❌ Failed to write to Google Sheets: {str(e)}")
+            return False
 
-        return meta_title, meta_description
+    async def write_multiple_blogs_async(self, blog_results):
+        """Write multiple blog results to Google Sheets with the appends in flight concurrently"""
+        import aiohttp
+
+        if not self.service:
+            print("❌ Google Sheets not connected")
+            return False
+
+        # Fetch the token once for every request instead of refreshing per write
+        token = self._bearer_token()
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')  # One stamp for the whole batch
+        connector = aiohttp.TCPConnector(limit=MAX_CONCURRENT_WRITES)
+        async with aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=30)) as session:
+            outcomes = await asyncio.gather(*[
+                self.write_blog_to_sheets_async(session, blog_result, token, announce=False, timestamp=timestamp)
+                for blog_result in blog_results
+            ])
+
+        saved = [blog_result for blog_result, ok in zip(blog_results, outcomes) if ok]
+        self._report_saved(saved, len(blog_results))
+        return len(saved) == len(blog_results)
 
     def write_blog_to_sheets(self, blog_result):
         """Write a single blog result to Google Sheets"""
@@ -149,33 +442,11 @@ class SheetsWriter:
             print("❌ Google Sheets not connected")
             return False
 
-        try:
-            # Extract meta information
-            meta_title, meta_description = self.extract_meta_from_blog(blog_result['content'])
-
-            # Prepare row data
-            row_data = [
-                datetime.now().strftime('%Y-%m-%d %H:%M:%S'),  # Timestamp
-                blog_result.get('topic', ''),  # Topic
-                meta_title,  # Meta Title
-                meta_description,  # Meta Description
-                blog_result.get('content', ''),  # Blog Content
-                blog_result.get('word_count', 0),  # Word Count
-                ', '.join(blog_result.get('seo_keywords_used', [])),  # SEO Keywords
-                ', '.join(blog_result.get('llm_keywords_used', [])),  # LLM Keywords
-                ', '.join(blog_result.get('links_used', [])),  # Links Used
-                blog_result.get('status', 'unknown'),  # Status
-                blog_result.get('error', '')  # Notes/Errors
-            ]
+        self._maybe_refresh_async()
 
+        try:
             # Append to sheet
-            self.service.spreadsheets().values().append(
-                spreadsheetId=self.sheet_id,
-                range='A2',  # Start from row 2 (after headers)
-                valueInputOption='RAW',
-                insertDataOption='INSERT_ROWS',
-                body={'values': [row_data]}
-            ).execute()
+            self._append_rows([self._build_row(blog_result)])
 
             print(f"✅ Blog '{blog_result.get('topic', 'Unknown')}' saved to Google Sheets!")
             return True
@@ -190,13 +461,20 @@ class SheetsWriter:
             print("❌ Google Sheets not connected")
             return False
 
-        success_count = 0
-        for blog_result in blog_results:
-            if self.write_blog_to_sheets(blog_result):
-                success_count += 1
+        if not blog_results:
+            return True
 
-        print(f"✅ Successfully saved {success_count}/{len(blog_results)} blogs to Google Sheets!")
-        return success_count == len(blog_results)
+        self._maybe_refresh_async()
+
+        # The values API takes any number of rows, so all blogs go in a single append
+        try:
+            self._append_rows(self._build_rows(blog_results))
+        except Exception as e:
+            print(f"❌ Failed to write to Google Sheets: {str(e)}")
+            return False
+
+        self._report_saved(blog_results, len(blog_results))
+        return True
 
     def test_connection(self):
         """Test Google Sheets connection"""
@@ -205,9 +483,11 @@ class SheetsWriter:
 
         try:
             # Try to read sheet metadata
-            sheet_metadata = self.service.spreadsheets().get(
-                spreadsheetId=self.sheet_id
-            ).execute()
+            sheet_metadata = self._execute(self.service.spreadsheets().get(
+                spreadsheetId=self.sheet_id,
+                fields='properties.title,sheets.properties.sheetId'
+            ))
+            self._tab_id = sheet_metadata['sheets'][0]['properties']['sheetId']
 
             sheet_title = sheet_metadata.get('properties', {}).get('title', 'Unknown')
             print(f"✅ Successfully connected to sheet: {sheet_title}")
@@ -225,17 +505,21 @@ if __name__ == "__main__":
     # Initialize sheets writer
     writer = SheetsWriter()
 
-    # Test connection
-    if not writer.test_connection():
+    # Test the connection and set up headers at the same time; each thread gets its own HTTP client
+    print("\n📋 Testing connection and setting up sheet headers...")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        connection_test = executor.submit(writer.test_connection)
+        header_setup = executor.submit(writer.setup_sheet_headers)
+        connected, headers_ready = connection_test.result(), header_setup.result()
+
+    if not connected:
         print("\n📝 To fix Google Sheets connection:")
         print("1. Make sure GOOGLE_SHEET_ID is in your .env file")
         print("2. Make sure credentials.json file exists")
         print("3. Make sure the sheet is shared with your service account email (if using service account)")
-        exit()
+        sys.exit(1)
 
-    # Setup headers
-    print("\n📋 Setting up sheet headers...")
-    if writer.setup_sheet_headers():
+    if headers_ready:
         print("✅ Sheet is ready for blog data!")
 
         # Test with sample data
@@ -0,0 +1,8 @@
+from app import app, initialize_components
+
+# Production entry point - run with:
+#   gunicorn -k gthread -w 4 --threads 8 -b 0.0.0.0:5000 wsgi:app
+if initialize_components():
+    print("✅ Components initialized successfully")
+else:
+    print("❌ Failed to initialize components")